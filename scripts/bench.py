@@ -0,0 +1,519 @@
+# Micro-benchmarks for the extraction pipeline (no browser needed).
+# Run: python scripts\bench.py [name ...]
+import csv, importlib.util, io, json, logging, os, random, re, subprocess, sys, tempfile, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location("web_scraper_module", os.path.join(ROOT, "web_scrapper.py"))
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+WORDS = ("selling", "contact", "inbox", "for", "details", "price", "available", "call", "the",
+         "group", "admin", "please", "dm", "me", "today", "new", "offer", "location", "lagos")
+
+def make_post(rng, n_words=60, n_emails=1):
+    # prose " at " (about 0.5% of words) is an obfuscation anchor too
+    words = [rng.choice(WORDS) if rng.random() >= 0.005 else "at" for _ in range(n_words)]
+    for _ in range(n_emails):
+        user = "user%d" % rng.randint(0, 9999)
+        if rng.random() < 0.3:
+            words.insert(rng.randint(0, len(words)), f"{user} [at] gmail [dot] com")
+        else:
+            words.insert(rng.randint(0, len(words)), f"{user}@gmail.com")
+    return " ".join(words)
+
+def timed(fn, *a, **kw):
+    t0 = time.perf_counter()
+    r = fn(*a, **kw)
+    return time.perf_counter() - t0, r
+
+def bench_cache(n=20000, unique=2000, seed=1):
+    """Repeated-text workload: `unique` distinct posts seen `n` times (Zipf-ish skew)."""
+    rng = random.Random(seed)
+    posts = [make_post(rng) for _ in range(unique)]
+    workload = [posts[min(int(rng.paretovariate(1.2)) - 1, unique - 1)] if rng.random() < 0.7
+                else rng.choice(posts) for _ in range(n)]
+
+    def plain():
+        for t in workload:
+            web_mod.extract_emails(t)
+
+    cache = web_mod.ExtractionCache(max_entries=unique // 2)
+
+    def cached():
+        for t in workload:
+            cache.extract(t)
+
+    t_plain, _ = timed(plain)
+    t_cached, _ = timed(cached)
+    st = cache.stats()
+    print(f"cache: {n} posts ({unique} unique, LRU size {cache.max_entries})")
+    print(f"  extract_emails      {t_plain:.3f}s  ({n / t_plain:,.0f} posts/s)")
+    print(f"  ExtractionCache     {t_cached:.3f}s  ({n / t_cached:,.0f} posts/s)  "
+          f"hit rate {st['hit_rate']:.1%}  speedup x{t_plain / t_cached:.1f}")
+
+def bench_windows(seed=2):
+    """Full-text regex pipeline vs anchor windows, on short posts and 10-50 KB posts."""
+    rng = random.Random(seed)
+    cases = [("short (~400 B)", [make_post(rng) for _ in range(2000)]),
+             ("long (10-50 KB)", [make_post(rng, n_words=rng.randint(1700, 8500), n_emails=2)
+                                  for _ in range(40)])]
+    for label, posts in cases:
+        norm = [web_mod.normalize_text(p) for p in posts]
+        t_full, r_full = timed(lambda: [web_mod._web_mod._extract_from_normalized(s) for s in norm])
+        t_win, r_win = timed(lambda: [web_mod.extract_emails_windowed(s) for s in norm])
+        assert r_full == r_win
+        kb = sum(len(s) for s in norm) / 1024
+        print(f"windows: {label}: {len(posts)} posts, {kb:,.0f} KB")
+        print(f"  full-text regexes   {t_full * 1000 / len(posts):.3f} ms/post  ({kb / t_full:,.0f} KB/s)")
+        print(f"  anchor windows      {t_win * 1000 / len(posts):.3f} ms/post  ({kb / t_win:,.0f} KB/s)  "
+              f"x{t_full / t_win:.1f}")
+
+def bench_records(n=200000, posts=20000, seed=3):
+    """Per-row lists (old writer path) vs EmailHit tuples vs the columnar HitBatch."""
+    rng = random.Random(seed)
+    doms = ("gmail.com", "yahoo.com", "outlook.com")
+    raw = [(i, rng.randrange(3), rng.randrange(posts)) for i in range(n)]
+
+    def fresh():
+        # strings arrive freshly built from the page, so equal links are distinct objects
+        for i, d, pid in raw:
+            yield (f"user{i}@{doms[d]}", "".join(["po", "st"]),
+                   f"https://web.facebook.com/groups/618488976536093/posts/{pid}", str(pid))
+
+    def as_lists():
+        return [[e, src, link] for e, src, link, _ in fresh()]
+
+    def as_tuples():
+        return [web_mod.EmailHit(*h) for h in fresh()]
+
+    def as_batch():
+        b = web_mod.HitBatch()
+        for e, src, link, pid in fresh():
+            b.add(e, src, link, pid)
+        return b
+
+    print(f"records: {n} hits over {posts} posts")
+    for label, build in (("list per row", as_lists), ("EmailHit", as_tuples), ("HitBatch", as_batch)):
+        t, obj = timed(build)
+        rows = obj.rows() if hasattr(obj, "rows") else obj
+        t_write, _ = timed(csv.writer(io.StringIO()).writerows, rows)
+        del obj, rows
+        tracemalloc.start()
+        obj = build()
+        cur, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del obj
+        print(f"  {label:<13} {cur / n:6.1f} B/record  build {n / t:>10,.0f} rows/s  "
+              f"csv {n / t_write:>10,.0f} rows/s")
+
+def children_max_rss_mb():
+    """Peak RSS of the largest finished child process, or None where resource is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+def bench_scan_file(gb=2.0, seed=4):
+    """--scan-file over a generated multi-GB dump vs a plain sequential read of the same file."""
+    rng = random.Random(seed)
+    block = "\n".join(make_post(rng, n_words=rng.randint(20, 400), n_emails=rng.randint(0, 2))
+                      for _ in range(4000)).encode("utf-8") + b"\n"
+    target = int(gb * 1024 ** 3)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "dump.txt")
+        with open(path, "wb") as f:
+            written = 0
+            while written < target:
+                f.write(block)
+                written += len(block)
+        mb = written / 1e6
+
+        def plain_read():
+            with open(path, "rb") as f:
+                while f.read(16 * 1024 * 1024):
+                    pass
+
+        t_read, _ = timed(plain_read)
+        print(f"scan-file: {mb:,.0f} MB dump, {os.cpu_count()} CPU(s)")
+        print(f"  sequential read     {t_read:.1f}s  ({mb / t_read:,.0f} MB/s)")
+        for workers in sorted({1, os.cpu_count() or 1}):
+            t, proc = timed(subprocess.run, [sys.executable, os.path.join(ROOT, "web scrapper.py"),
+                                             "--scan-file", path, "--workers", str(workers)],
+                            capture_output=True, text=True)
+            m = re.search(r"saved to (.+)$", proc.stdout.strip())
+            if m and os.path.exists(m.group(1)):
+                os.remove(m.group(1))
+            rss = children_max_rss_mb()
+            mem = "max process RSS n/a" if rss is None else f"max process RSS {rss:,.0f} MB"
+            print(f"  --workers {workers:<9} {t:.1f}s  ({mb / t:,.0f} MB/s)  {mem}")
+
+class SimClock:
+    """Virtual clock: simulated browser calls advance it instead of sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance_ms(self, ms):
+        self.now += ms / 1000.0
+
+class SimLocator:
+    def __init__(self, post):
+        self._post = post
+
+    def count(self):
+        self._post.clock.advance_ms(5)
+        return 1 if self._post.has_button() else 0
+
+    @property
+    def first(self):
+        return self
+
+    def click(self, timeout=None):
+        self._post.clock.advance_ms(20)
+        self._post.clicks += 1
+        if not self._post.sticky and self._post.expand_at is None:
+            self._post.expand_at = self._post.clock.now + self._post.expand_latency_ms / 1000.0
+
+class SimPost:
+    """
+    A feed post with browser-like latencies. kind: "plain" (not truncated), "truncated"
+    (See more expands after expand_latency_ms) or "sticky" (a "See more" that never
+    changes the text, e.g. on a comment).
+    """
+
+    def __init__(self, clock, kind, text, expand_latency_ms=120, read_ms=15):
+        self.clock = clock
+        self.kind = kind
+        self.sticky = kind == "sticky"
+        self.text = text
+        self.expand_latency_ms = expand_latency_ms
+        self.read_ms = read_ms
+        self.expand_at = None
+        self.clicks = 0
+
+    def expanded(self):
+        return self.expand_at is not None and self.clock.now >= self.expand_at
+
+    def has_button(self):
+        return self.kind != "plain" and not self.expanded()
+
+    def inner_text(self, timeout=None):
+        self.clock.advance_ms(self.read_ms)
+        if self.kind == "plain" or self.expanded():
+            return self.text
+        return self.text[:120] + "… See more"
+
+    def locator(self, selector):
+        return SimLocator(self)
+
+    def element_handle(self, timeout=None):
+        self.clock.advance_ms(3)
+        return self
+
+    def dispose(self):
+        self.clock.advance_ms(2)
+
+class SimPage:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def wait_for_timeout(self, ms):
+        self.clock.advance_ms(ms)
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        post = arg[0]
+        if post.expand_at is not None and post.expand_at - self.clock.now <= timeout / 1000.0:
+            self.clock.now = max(self.clock.now, post.expand_at) + 0.004
+            return True
+        self.clock.advance_ms(timeout)
+        raise TimeoutError("wait_for_function timed out")
+
+class SimFeedLocator:
+    def __init__(self, feed):
+        self._feed = feed
+
+    def count(self):
+        self._feed.clock.advance_ms(5)
+        return self._feed.loaded()
+
+    def nth(self, i):
+        return self._feed.posts[i]
+
+class SimMouse:
+    def __init__(self, feed):
+        self._feed = feed
+
+    def wheel(self, dx, dy):
+        self._feed.scroll()
+
+class SimFeedPage(SimPage):
+    """
+    A finite feed on a virtual clock: `batch` posts are rendered up front and each scroll
+    near the bottom loads the next batch after load_ms. Once everything is loaded the page
+    can show an end-of-results marker.
+    """
+
+    def __init__(self, clock, posts, batch=10, load_ms=700, end_marker=False):
+        super().__init__(clock)
+        self.posts = posts
+        self.batch = batch
+        self.load_ms = load_ms
+        self.end_marker = end_marker
+        self._loaded = min(batch, len(posts))
+        self._pending = []  # (ready_at, new_loaded)
+        self.mouse = SimMouse(self)
+
+    def _settle(self):
+        while self._pending and self._pending[0][0] <= self.clock.now:
+            self._loaded = max(self._loaded, self._pending.pop(0)[1])
+
+    def loaded(self):
+        self._settle()
+        return self._loaded
+
+    def scroll(self):
+        self.clock.advance_ms(10)
+        target = min(len(self.posts), self.loaded() + self.batch)
+        if target > self._loaded and not self._pending:
+            self._pending.append((self.clock.now + self.load_ms / 1000.0, target))
+
+    def locator(self, selector):
+        return SimFeedLocator(self)
+
+    def evaluate(self, expression, arg=None):
+        self.clock.advance_ms(8)
+        done = self.loaded() >= len(self.posts)
+        return [1000 + 800 * self.loaded(), self.end_marker and done]
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        if not isinstance(arg[0], str):
+            return super().wait_for_function(expression, arg, timeout)
+        n = arg[1]
+        self._settle()
+        if self._pending and self._pending[0][1] > n and self._pending[0][0] - self.clock.now <= timeout / 1000.0:
+            self.clock.now = max(self.clock.now, self._pending[0][0])
+            self._settle()
+            return True
+        if self._loaded > n:
+            return True
+        self.clock.advance_ms(timeout)
+        raise TimeoutError("wait_for_function timed out")
+
+def make_sim_posts(clock, n, rng):
+    posts = []
+    for _ in range(n):
+        r = rng.random()
+        kind = "plain" if r < 0.70 else ("truncated" if r < 0.95 else "sticky")
+        posts.append(SimPost(clock, kind, make_post(rng, n_words=rng.randint(30, 200)),
+                             expand_latency_ms=rng.lognormvariate(4.8, 0.5)))
+    return posts
+
+def legacy_read_post_text(page, post):
+    # the scan loop's old fixed-wait expansion, kept here as the baseline
+    for _ in range(4):
+        try:
+            btns = post.locator("text=/see more/i")
+            if btns.count():
+                try:
+                    btns.first.click()
+                    page.wait_for_timeout(400)
+                except Exception:
+                    break
+            else:
+                break
+        except Exception:
+            break
+    try:
+        return post.inner_text(timeout=2500) or ""
+    except Exception:
+        return ""
+
+def bench_expand(n=2000, seed=5):
+    """Seconds per post for "See more" handling on simulated posts (virtual clock)."""
+    print(f"expand: {n} simulated posts (70% plain, 25% truncated, 5% sticky See more)")
+    for label in ("fixed 400 ms waits", "ExpansionBudget"):
+        clock = SimClock()
+        page = SimPage(clock)
+        posts = make_sim_posts(clock, n, random.Random(seed))
+        budget = web_mod.ExpansionBudget(clock=clock)
+        by_kind = {}
+        missed = 0
+        for post in posts:
+            t0 = clock.now
+            if label == "ExpansionBudget":
+                text = web_mod.read_post_text(page, post, budget)
+            else:
+                text = legacy_read_post_text(page, post)
+            missed += post.kind == "truncated" and text != post.text
+            by_kind.setdefault(post.kind, []).append(clock.now - t0)
+        detail = "  ".join(f"{k} {sum(v) / len(v):.3f}" for k, v in sorted(by_kind.items()))
+        extra = f"  (wait cap {budget.wait_ms()} ms)" if label == "ExpansionBudget" else ""
+        print(f"  {label:<19} {clock.now / n:.3f} s/post  [{detail}]  "
+              f"truncated posts left collapsed: {missed}{extra}")
+
+class SlowStdout(io.TextIOBase):
+    """Stand-in for a slow terminal or a pipe with a lagging reader."""
+
+    def __init__(self, delay_s=0.0002):
+        self.delay_s = delay_s
+        self.lines = 0
+
+    def write(self, data):
+        time.sleep(self.delay_s)
+        self.lines += data.count("\n")
+        return len(data)
+
+def bench_logging(rounds=2000, emails_per_round=2):
+    """Driver-thread time for the scan loop's log lines when stdout is slow (200 us/write)."""
+    log = logging.getLogger("fb_scraper")
+
+    def loop(emit_progress, emit_email):
+        for r in range(rounds):
+            emit_progress(r)
+            for k in range(emails_per_round):
+                emit_email(f"user{r}_{k}@gmail.com", f"https://web.facebook.com/groups/1/posts/{r}")
+
+    real_stdout = sys.stdout
+    results = []
+    try:
+        sys.stdout = slow = SlowStdout()
+        t, _ = timed(loop, lambda r: print(f"[*] progress: total_posts={r} scanned_until={r}"),
+                     lambda e, link: print(f"[+] {e} -> {link} (saved to emails_basic_1.csv)"))
+        results.append(("print (old)", t, slow.lines))
+        for label, level in (("queued, INFO", "INFO"), ("queued, WARNING", "WARNING")):
+            sys.stdout = slow = SlowStdout()
+            web_mod.setup_logging(level)
+            progress = web_mod.ProgressThrottle(5.0)
+
+            def emit_progress(r):
+                if log.isEnabledFor(logging.DEBUG) or (log.isEnabledFor(logging.INFO) and progress.ready()):
+                    log.info(f"[*] progress: total_posts={r} scanned_until={r}",
+                             extra={"event": "progress", "total_posts": r, "scanned_until": r})
+
+            def emit_email(e, link):
+                if log.isEnabledFor(logging.INFO):
+                    log.info(f"[+] {e} -> {link} (saved to emails_basic_1.csv)",
+                             extra={"event": "email", "email": e, "link": link, "file": "emails_basic_1.csv"})
+
+            t, _ = timed(loop, emit_progress, emit_email)
+            web_mod.shutdown_logging()
+            results.append((label, t, slow.lines))
+    finally:
+        sys.stdout = real_stdout
+    print(f"logging: {rounds} scan rounds, {emails_per_round} emails/round, stdout at 200 us/write")
+    for label, t, lines in results:
+        print(f"  {label:<16} {t * 1e6 / rounds:8.1f} us/round in the scan loop  ({lines} lines written)")
+
+def legacy_scan_feed(page, handle_post, sleep):
+    # the scan loop's old termination heuristic (5 idle rounds, then up to 60 scrolls)
+    last_index = 0
+    scroll_attempts = 0
+    no_new_rounds = 0
+    while scroll_attempts < 200:
+        count = page.locator("article").count()
+        if count <= last_index:
+            no_new_rounds += 1
+        else:
+            no_new_rounds = 0
+        new_found = False
+        for i in range(last_index, count):
+            new_found = handle_post(page.locator("article").nth(i)) or new_found
+        last_index = max(last_index, count)
+        if new_found:
+            scroll_attempts = 0
+        if no_new_rounds >= 5:
+            page.mouse.wheel(0, 3000)
+            sleep(1.0)
+            scroll_attempts += 1
+            if scroll_attempts >= 60:
+                break
+        else:
+            sleep(0.6)
+
+def bench_feed_end(n_posts=300, seed=6):
+    """Tail latency from the last new post to exit on a finite simulated feed (virtual clock)."""
+    print(f"feed-end: {n_posts}-post feed, 10 posts per scroll, 700 ms load")
+    for label, end_marker in (("no end marker", False), ("end marker shown", True)):
+        for impl in ("old heuristic", "FeedEndDetector"):
+            clock = SimClock()
+            rng = random.Random(seed)
+            posts = [SimPost(clock, "plain", make_post(rng, n_words=40)) for _ in range(n_posts)]
+            page = SimFeedPage(clock, posts, end_marker=end_marker)
+            seen = []
+
+            def handle_post(post):
+                # about a third of the posts yield a new email
+                seen.append(clock.now)
+                post.inner_text()
+                return len(seen) % 3 == 0
+
+            sleep = lambda s: clock.advance_ms(s * 1000)
+            if impl == "old heuristic":
+                legacy_scan_feed(page, handle_post, sleep)
+            else:
+                web_mod.scan_feed(page, handle_post, web_mod.FeedEndDetector(), sleep=sleep)
+            assert len(seen) == n_posts
+            print(f"  {label:<17} {impl:<16} tail {clock.now - seen[-1]:6.1f}s  total {clock.now:6.1f}s")
+
+class CapturedSource:
+    """Fake post whose evaluate() returns a typical capture: ~12 anchors and a timestamp."""
+
+    def __init__(self, rng, i):
+        pid = 10 ** 15 + i
+        self._raw = {
+            "attrs": {"data-ft": '{"top_level_post_id":"%d"}' % pid},
+            "a": ([{"href": f"/user.{rng.randrange(5000)}?__cft__[0]=AZ{rng.getrandbits(64):x}&__tn__=-R"}]
+                  + [{"href": f"https://web.facebook.com/groups/618488976536093/posts/{pid}/?__cft__[0]=AZ{rng.getrandbits(64):x}"}]
+                  + [{"href": f"/hashtag/{rng.choice(WORDS)}?__eep__=6"} for _ in range(rng.randint(0, 4))]
+                  + [{"href": "#", "title": "Like"}] * 6),
+            "abbr": [{"data-utime": str(1700000000 + i * 37)}],
+            "time": [],
+        }
+
+    def evaluate(self, expression, arg=None):
+        return self._raw
+
+def bench_archive(n=20000, seed=7):
+    """Archive bytes per post, append throughput and --replay throughput."""
+    rng = random.Random(seed)
+    payloads = [web_mod.capture_post(CapturedSource(rng, i), make_post(rng, n_words=rng.randint(20, 200)),
+                                     source="https://web.facebook.com/groups/618488976536093")
+                for i in range(n)]
+    raw_bytes = sum(len(json.dumps(p, ensure_ascii=False, separators=(",", ":"))) + 1 for p in payloads)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "raw.jsonl.gz")
+
+        def write():
+            arch = web_mod.RawArchive(path)
+            for p in payloads:
+                arch.append(p)
+            arch.close()
+            return arch
+
+        t_write, arch = timed(write)
+        t_read, n_read = timed(lambda: sum(1 for _ in web_mod.iter_archive(path)))
+        t_replay, (hits, posts) = timed(web_mod.replay_archive, path)
+        assert n_read == posts == n
+        print(f"archive: {n} posts, {raw_bytes / n:,.0f} B/post as raw JSON lines")
+        print(f"  archive size        {arch.bytes_written / n:,.0f} B/post "
+              f"(x{raw_bytes / arch.bytes_written:.1f} smaller), {len(web_mod.read_archive_index(path))} chunks")
+        print(f"  append              {n / t_write:>9,.0f} posts/s")
+        print(f"  decode only         {n / t_read:>9,.0f} posts/s  ({raw_bytes / 1e6 / t_read:,.0f} MB/s of JSON)")
+        print(f"  replay (parsers)    {n / t_replay:>9,.0f} posts/s  ({len(hits)} unique emails)")
+
+BENCHES = {"cache": bench_cache, "windows": bench_windows, "records": bench_records,
+           "scan-file": bench_scan_file, "expand": bench_expand,
+           "logging": bench_logging, "feed-end": bench_feed_end,
+           "archive": bench_archive}
+
+def main():
+    names = sys.argv[1:] or list(BENCHES)
+    for name in names:
+        BENCHES[name]()
+
+if __name__ == "__main__":
+    main()
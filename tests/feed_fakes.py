@@ -0,0 +1,53 @@
+# Fake Playwright feed page shared by the scan_feed tests (no browser needed)
+
+class FakeMouse:
+    def __init__(self, feed):
+        self._feed = feed
+
+    def wheel(self, dx, dy):
+        self._feed.scrolls += 1
+        self._feed.loaded = min(len(self._feed.posts), self._feed.loaded + self._feed.batch)
+
+class FakeFeedLocator:
+    def __init__(self, feed):
+        self._feed = feed
+
+    def count(self):
+        self._feed._check_open()
+        return self._feed.loaded
+
+    def nth(self, i):
+        return self._feed.posts[i]
+
+class FakeFeedPage:
+    """Feed that loads `batch` more posts on every scroll until all are shown."""
+
+    def __init__(self, n_posts, batch=5, end_marker=False, posts=None):
+        self.posts = list(posts) if posts is not None else [f"post{i}" for i in range(n_posts)]
+        n_posts = len(self.posts)
+        self.batch = batch
+        self.loaded = min(batch, n_posts)
+        self.end_marker = end_marker
+        self.scrolls = 0
+        self.mouse = FakeMouse(self)
+        self.closed = False
+        # the browser dies once this many posts have been loaded (None: never)
+        self.close_after = None
+
+    def _check_open(self):
+        if self.close_after is not None and self.loaded >= self.close_after:
+            self.closed = True
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+
+    def locator(self, selector):
+        return FakeFeedLocator(self)
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        self._check_open()
+        if self.loaded <= arg[1]:
+            raise TimeoutError("no new posts")
+
+    def evaluate(self, expression, arg=None):
+        self._check_open()
+        return [100 * self.loaded, self.end_marker and self.loaded == len(self.posts)]
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+capture_post = web_mod.capture_post
+CapturedPost = web_mod.CapturedPost
+RawArchive = web_mod.RawArchive
+read_archive_index = web_mod.read_archive_index
+iter_archive = web_mod.iter_archive
+replay_archive = web_mod.replay_archive
+PostRecord = web_mod.PostRecord
+
+class FakePost:
+    def __init__(self, raw):
+        self._raw = raw
+
+    def evaluate(self, expression, arg=None):
+        return self._raw
+
+def make_payload(i, text):
+    raw = {"attrs": {"data-ft": '{"top_level_post_id":"%d"}' % (1000 + i)},
+           "a": [{"href": "/user%d" % i}, {"href": "https://web.facebook.com/groups/1/posts/%d" % (1000 + i)}],
+           "abbr": [{"data-utime": "1609459200"}], "time": []}
+    return capture_post(FakePost(raw), text, source="https://web.facebook.com/groups/1")
+
+class ArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "raw.jsonl.gz")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_captured_post_feeds_the_parsers(self):
+        rec = PostRecord.from_post(CapturedPost(make_payload(1, "hi")))
+        self.assertEqual(rec.post_id, "1001")
+        self.assertEqual(rec.link, "https://web.facebook.com/user1")
+        self.assertEqual(rec.author_username, "user1")
+        self.assertEqual(rec.post_date, "2021-01-01T00:00:00Z")
+        self.assertEqual(CapturedPost(make_payload(1, "hi")).inner_text(), "hi")
+
+    def test_chunked_roundtrip(self):
+        arch = RawArchive(self.path, chunk_records=4)
+        payloads = [make_payload(i, f"post {i}") for i in range(10)]
+        for p in payloads:
+            arch.append(p)
+        arch.close()
+        self.assertEqual([c["records"] for c in read_archive_index(self.path)], [4, 4, 2])
+        self.assertEqual(list(iter_archive(self.path)), payloads)
+        self.assertEqual(arch.bytes_written, os.path.getsize(self.path))
+
+    def test_reopen_appends_and_drops_unindexed_tail(self):
+        arch = RawArchive(self.path, chunk_records=2)
+        for i in range(2):
+            arch.append(make_payload(i, f"post {i}"))
+        arch.close()
+        with open(self.path, "ab") as f:
+            f.write(b"\x1f\x8b partial chunk from a killed run")
+        self.assertEqual(len(list(iter_archive(self.path))), 2)
+        arch = RawArchive(self.path, chunk_records=2)
+        arch.append(make_payload(2, "post 2"))
+        arch.close()
+        self.assertEqual([p["text"] for p in iter_archive(self.path)], ["post 0", "post 1", "post 2"])
+
+    def test_refuses_non_archive_file(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("my notes\n")
+        with self.assertRaises(ValueError):
+            RawArchive(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "my notes\n")
+
+    def test_reopen_repairs_torn_index_line(self):
+        arch = RawArchive(self.path, chunk_records=1)
+        arch.append(make_payload(0, "post 0"))
+        arch.append(make_payload(1, "post 1"))
+        arch.close()
+        # kill mid-write: second chunk's index line loses its tail
+        with open(self.path + ".idx", "rb+") as f:
+            f.truncate(os.path.getsize(self.path + ".idx") - 5)
+        self.assertEqual([p["text"] for p in iter_archive(self.path)], ["post 0"])
+        arch = RawArchive(self.path, chunk_records=1)
+        arch.append(make_payload(2, "post 2"))
+        arch.close()
+        RawArchive(self.path).close()
+        self.assertEqual([p["text"] for p in iter_archive(self.path)], ["post 0", "post 2"])
+
+    def test_malformed_index_lines_count_as_torn(self):
+        arch = RawArchive(self.path, chunk_records=1)
+        arch.append(make_payload(0, "post 0"))
+        arch.close()
+        size = os.path.getsize(self.path)
+        for bad in (b"[1, 2]", b"null", b'"x"', b'{"offset": %d, "length": "9"}' % size,
+                    b'{"offset": %d}' % size, b'{"offset": true, "length": 9}', b"\xff\xfe"):
+            with open(self.path + ".idx", "rb") as f:
+                good = f.readline()
+            with open(self.path + ".idx", "wb") as f:
+                f.write(good + bad + b"\n")
+            self.assertEqual([p["text"] for p in iter_archive(self.path)], ["post 0"], bad)
+            RawArchive(self.path).close()
+            with open(self.path + ".idx", "rb") as f:
+                self.assertEqual(f.read(), good, bad)
+
+    def test_missing_directory_raises_oserror(self):
+        with self.assertRaises(OSError):
+            RawArchive(os.path.join(self._dir.name, "no", "such", "raw.jsonl.gz"))
+
+    def test_replay_process_pool(self):
+        arch = RawArchive(self.path, chunk_records=2)
+        for i in range(7):
+            arch.append(make_payload(i, f"mail user{i % 5}@x.com"))
+        arch.close()
+        self.assertEqual(replay_archive(self.path, workers=2), replay_archive(self.path, workers=1))
+        hits, posts = replay_archive(self.path, workers=2)
+        self.assertEqual((len(hits), posts), (5, 7))
+
+    def test_replay_runs_current_parsers(self):
+        arch = RawArchive(self.path)
+        arch.append(make_payload(1, "mail a@x.com"))
+        arch.append(make_payload(2, "again a@x.com or bob [at] y [dot] org"))
+        arch.append(make_payload(3, "nothing"))
+        arch.close()
+        hits, posts = replay_archive(self.path)
+        self.assertEqual(posts, 3)
+        self.assertEqual([(h.email, h.post_id) for h in hits], [("a@x.com", "1001"), ("bob@y.org", "1002")])
+        self.assertEqual(hits[0].source, "https://web.facebook.com/groups/1")
+
+if __name__ == "__main__":
+    unittest.main()
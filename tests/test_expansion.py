@@ -0,0 +1,191 @@
+import os
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+ExpansionBudget = web_mod.ExpansionBudget
+read_post_text = web_mod.read_post_text
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeButton:
+    def __init__(self, post):
+        self._post = post
+
+    def count(self):
+        return 1 if self._post.button else 0
+
+    @property
+    def first(self):
+        return self
+
+    def click(self, timeout=None):
+        self._post.clicks += 1
+
+class FakePost:
+    def __init__(self, texts, button=True, changes=True):
+        self._texts = list(texts)
+        self.button = button
+        self.changes = changes
+        self.clicks = 0
+        self.selectors = []
+        self.handles = 0
+        self.disposed = 0
+
+    def inner_text(self, timeout=None):
+        return self._texts[min(self.clicks, len(self._texts) - 1)] if self.changes else self._texts[0]
+
+    def locator(self, selector):
+        self.selectors.append(selector)
+        return FakeButton(self)
+
+    def element_handle(self, timeout=None):
+        self.handles += 1
+        return self
+
+    def dispose(self):
+        self.disposed += 1
+
+class FakePage:
+    def __init__(self, clock=None):
+        self.clock = clock
+        self.waits = []
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        post, before_len = arg
+        self.waits.append(timeout)
+        if self.clock:
+            self.clock.now += timeout / 1000.0
+        if len(post.inner_text()) == before_len:
+            raise TimeoutError("no change")
+
+class LatencyPage:
+    """Expansion lands `latency_ms` after the click; shorter waits time out."""
+
+    def __init__(self, clock, latency_ms):
+        self.clock = clock
+        self.latency_ms = latency_ms
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        if timeout < self.latency_ms:
+            self.clock.now += timeout / 1000.0
+            raise TimeoutError("no change yet")
+        self.clock.now += self.latency_ms / 1000.0
+
+class SlowReadPost(FakePost):
+    """inner_text takes `read_ms` on the fake clock and times out below that."""
+
+    def __init__(self, texts, clock, read_ms):
+        super().__init__(texts)
+        self.clock = clock
+        self.read_ms = read_ms
+
+    def inner_text(self, timeout=None):
+        if timeout < self.read_ms:
+            self.clock.now += timeout / 1000.0
+            raise TimeoutError("inner_text timed out")
+        self.clock.now += self.read_ms / 1000.0
+        return super().inner_text(timeout)
+
+class ExpansionTest(unittest.TestCase):
+    def test_untruncated_post_skips_expansion(self):
+        post = FakePost(["short post, mail a@x.com"])
+        budget = ExpansionBudget()
+        self.assertEqual(read_post_text(FakePage(), post, budget), "short post, mail a@x.com")
+        self.assertEqual(post.selectors, [])
+        self.assertEqual(budget.skipped, 1)
+
+    def test_truncated_post_is_expanded(self):
+        post = FakePost(["mail me at… See more", "mail me at a@x.com thanks"])
+        budget = ExpansionBudget()
+        self.assertEqual(read_post_text(FakePage(), post, budget), "mail me at a@x.com thanks")
+        self.assertEqual((post.clicks, budget.expanded, budget.stalled), (1, 1, 0))
+        self.assertEqual((post.handles, post.disposed), (1, 1))
+
+    def test_click_without_dom_change_stops(self):
+        post = FakePost(["comments… See more"], changes=False)
+        budget = ExpansionBudget()
+        page = FakePage()
+        self.assertEqual(read_post_text(page, post, budget), "comments… See more")
+        self.assertEqual(post.clicks, 1)
+        self.assertEqual(budget.stalled, 1)
+        self.assertEqual(page.waits, [400])
+        self.assertEqual((post.handles, post.disposed), (1, 1))
+
+    def test_post_budget_limits_clicks(self):
+        clock = FakeClock()
+        post = FakePost(["a… See more", "ab… See more", "abc… See more", "abcd… See more", "abcde"])
+        budget = ExpansionBudget(post_budget_ms=700, clock=clock)
+        read_post_text(FakePage(clock), post, budget)
+        self.assertEqual(post.clicks, 2)
+
+    def test_wait_cap_learns_from_latencies(self):
+        budget = ExpansionBudget()
+        self.assertEqual(budget.wait_ms(), 400)
+        for ms in (60, 70, 80, 90, 100):
+            budget.observe_expand(ms, True)
+        self.assertEqual(budget.wait_ms(), 180)
+        for _ in range(5):
+            budget.observe_expand(5000, True)
+        self.assertEqual(budget.wait_ms(), 1500)
+        for ms in (10, 10, 10, 10, 10):
+            budget.observe_text(ms)
+        self.assertEqual(budget.text_timeout_ms(), 500)
+
+    def test_wait_cap_recovers_when_page_slows_down(self):
+        clock = FakeClock()
+        budget = ExpansionBudget(clock=clock)
+        page = LatencyPage(clock, 80)
+        expanded = []
+        for i in range(100):
+            if i == 40:
+                page.latency_ms = 600
+            post = FakePost(["mail me at… See more", "mail me at a@x.com thanks"])
+            expanded.append(read_post_text(page, post, budget) == "mail me at a@x.com thanks")
+        self.assertTrue(all(expanded[:40]))
+        # a few posts are lost while the cap catches up, then every post expands again
+        self.assertLessEqual(expanded[40:].count(False), 3)
+        self.assertTrue(all(expanded[45:]))
+        self.assertGreaterEqual(budget.wait_ms(), 600)
+
+    def test_lone_stall_keeps_the_cap(self):
+        budget = ExpansionBudget()
+        for ms in (60, 70, 80, 90, 100):
+            budget.observe_expand(ms, True)
+        budget.observe_expand(180, False)
+        self.assertEqual(budget.wait_ms(), 180)
+        budget.observe_expand(180, False)
+        self.assertEqual(budget.wait_ms(), 360)
+
+    def test_slow_read_is_retried_with_the_initial_timeout(self):
+        clock = FakeClock()
+        budget = ExpansionBudget(clock=clock)
+        for _ in range(10):
+            read_post_text(FakePage(), SlowReadPost(["quick a@x.com"], clock, 20), budget)
+        self.assertEqual(budget.text_timeout_ms(), 500)
+        self.assertEqual(read_post_text(FakePage(), SlowReadPost(["slow b@x.com"], clock, 1200), budget),
+                         "slow b@x.com")
+        self.assertEqual((budget.text_retries, budget.unreadable, budget.skipped), (1, 0, 11))
+        for _ in range(3):
+            read_post_text(FakePage(), SlowReadPost(["slow b@x.com"], clock, 1200), budget)
+        self.assertGreater(budget.text_timeout_ms(), 1200)
+
+    def test_unreadable_post_is_not_counted_as_skipped(self):
+        clock = FakeClock()
+        budget = ExpansionBudget(clock=clock)
+        self.assertEqual(read_post_text(FakePage(), SlowReadPost(["x"], clock, 9000), budget), "")
+        self.assertEqual((budget.unreadable, budget.skipped), (1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
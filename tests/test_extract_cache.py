@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+from unittest import mock
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+extract_emails = web_mod.extract_emails
+ExtractionCache = web_mod.ExtractionCache
+
+class ExtractionCacheTest(unittest.TestCase):
+    def test_matches_extract_emails(self):
+        cache = ExtractionCache()
+        for s in ["", "a@x.com b@x.com", "bob [at] example [dot] com", "nothing here"]:
+            self.assertEqual(cache.extract(s), extract_emails(s))
+
+    def test_miss_uses_windowed_path(self):
+        s = "reach me: jane [at] example [dot] org, thanks"
+        orig = web_mod._web_mod.extract_emails_windowed
+        with mock.patch.object(web_mod._web_mod, "extract_emails_windowed", wraps=orig) as windowed:
+            self.assertEqual(ExtractionCache().extract(s), ["jane@example.org"])
+        windowed.assert_called_once()
+
+    def test_hit_on_equivalent_normalized_text(self):
+        cache = ExtractionCache()
+        cache.extract("mail: a&#64;x.com")
+        cache.extract("mail: a@x.com")
+        st = cache.stats()
+        self.assertEqual((st["hits"], st["misses"]), (1, 1))
+        self.assertAlmostEqual(st["hit_rate"], 0.5)
+
+    def test_returned_list_is_a_copy(self):
+        cache = ExtractionCache()
+        cache.extract("a@x.com").append("junk")
+        self.assertEqual(cache.extract("a@x.com"), ["a@x.com"])
+
+    def test_lru_eviction(self):
+        cache = ExtractionCache(max_entries=2)
+        cache.extract("a@x.com")
+        cache.extract("b@x.com")
+        cache.extract("a@x.com")  # refresh a
+        cache.extract("c@x.com")  # evicts b
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.extract("a@x.com")
+        self.assertEqual(cache.stats()["hits"], 2)
+        cache.extract("b@x.com")
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_persistence_and_engine_invalidation(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "cache.json")
+            c1 = ExtractionCache(path=path)
+            c1.extract("a@x.com")
+            c1.save()
+            c2 = ExtractionCache(path=path)
+            self.assertEqual(len(c2), 1)
+            self.assertEqual(c2.extract("a@x.com"), ["a@x.com"])
+            self.assertEqual(c2.stats()["hits"], 1)
+            c3 = ExtractionCache(path=path, engine_version="other")
+            self.assertEqual(len(c3), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import random
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+extract_emails = web_mod.extract_emails
+extract_emails_windowed = web_mod.extract_emails_windowed
+locate_candidate_windows = web_mod.locate_candidate_windows
+normalize_text = web_mod.normalize_text
+# the full-text pipeline the windows must agree with
+extract_full = web_mod._web_mod._extract_from_normalized
+
+# fragments chosen to stress window edges: obfuscation tokens, stray punctuation,
+# back-to-back anchors and whitespace runs around separators
+TOKENS = ["a", "bob", "x.y", "user+tag", "@", "@@", "[at]", "(at)", " at ", "  at  ", "AT",
+          "[dot]", "(dot)", " dot ", "dot", "xdot", ".", "..", "com", "org", "gmail", "co.uk",
+          ",", ";", "\n", "\t", "  ", "-", "_", "!", "'", "<", ">", "(", ")", "[", "]", "&",
+          "1", "b@c.com", "q at w dot e"]
+
+class WindowedExtractionTest(unittest.TestCase):
+    def test_differential_against_full_scan(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            s = "".join(rng.choice(TOKENS) + (" " if rng.random() < 0.5 else "")
+                        for _ in range(rng.randint(1, 40)))
+            self.assertEqual(extract_emails(s), extract_full(normalize_text(s)), repr(s))
+
+    def test_long_text_uses_windows(self):
+        filler = "lorem ipsum dolor sit amet " * 400
+        s = filler + "reach me: jane [at] example [dot] org, " + filler + "or bob@x.com, " + filler
+        self.assertEqual(extract_emails(s), ["bob@x.com", "jane@example.org"])
+
+    def test_windows_are_small_and_merged(self):
+        s = "x " * 1000 + "a@b.com c@d.com" + " y" * 1000
+        windows = locate_candidate_windows(s)
+        self.assertEqual(len(windows), 1)
+        a, b = windows[0]
+        self.assertLess(b - a, 200)
+        self.assertIn("a@b.com c@d.com", s[a:b])
+
+    def test_anchor_runs_without_whitespace_stay_linear(self):
+        s = "@" * 200000 + " a@b.com"
+        windows = locate_candidate_windows(s)
+        self.assertEqual(windows, [(0, len(s))])
+        self.assertEqual(extract_emails(s), extract_full(s))
+
+    def test_no_anchor_no_windows(self):
+        self.assertEqual(locate_candidate_windows("nothing to see here " * 50), [])
+        self.assertEqual(extract_emails("nothing to see here " * 500), [])
+
+if __name__ == "__main__":
+    unittest.main()
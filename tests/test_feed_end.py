@@ -0,0 +1,94 @@
+import os
+import unittest
+import importlib.util
+
+from feed_fakes import FakeFeedPage
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+FeedEndDetector = web_mod.FeedEndDetector
+scan_feed = web_mod.scan_feed
+
+class FeedEndTest(unittest.TestCase):
+    def test_detector_needs_a_stable_window(self):
+        det = FeedEndDetector(window=3)
+        self.assertFalse(det.observe(10, 500))
+        self.assertFalse(det.observe(10, 500))
+        self.assertFalse(det.observe(10, 500))
+        self.assertTrue(det.observe(10, 500))
+
+    def test_detector_resets_on_growth(self):
+        det = FeedEndDetector(window=2)
+        det.observe(10, 500)
+        det.observe(10, 500)
+        self.assertFalse(det.observe(10, 900))
+        self.assertFalse(det.observe(10, 900))
+        self.assertTrue(det.observe(10, 900))
+
+    def test_end_marker_shortens_the_window(self):
+        det = FeedEndDetector(window=5, marker_window=1)
+        self.assertFalse(det.observe(10, 500, end_marker=True))
+        self.assertTrue(det.observe(10, 500, end_marker=True))
+
+    def test_scan_feed_stops_at_end_of_feed(self):
+        page = FakeFeedPage(23)
+        handled = []
+        rounds = []
+        reason = scan_feed(page, handled.append, FeedEndDetector(window=3),
+                           on_round=lambda: rounds.append(len(handled)), sleep=lambda s: None)
+        self.assertEqual(reason, "end-of-feed")
+        self.assertEqual(handled, page.posts)
+        # 4 scrolls load the rest, then 3 fruitless scrolls fill the stability window
+        self.assertEqual(page.scrolls, 4 + 3)
+        self.assertEqual(rounds[-1], 23)
+
+    def test_scan_feed_with_end_marker(self):
+        page = FakeFeedPage(23, end_marker=True)
+        reason = scan_feed(page, lambda post: None, FeedEndDetector(window=3), sleep=lambda s: None)
+        self.assertEqual(reason, "end-of-feed")
+        self.assertEqual(page.scrolls, 4 + 1)
+
+    def test_scan_feed_max_scrolls(self):
+        page = FakeFeedPage(3)
+        reason = scan_feed(page, lambda post: None, FeedEndDetector(window=50), max_scrolls=5,
+                           sleep=lambda s: None)
+        self.assertEqual(reason, "max-scrolls")
+        self.assertEqual(page.scrolls, 5)
+
+    def test_closed_page_is_not_end_of_feed(self):
+        page = FakeFeedPage(23)
+        page.closed = True
+        reason = scan_feed(page, lambda post: None, FeedEndDetector(window=1), sleep=lambda s: None)
+        self.assertEqual(reason, "page-error")
+
+    def test_feed_dying_partway_reports_page_error(self):
+        page = FakeFeedPage(23)
+        page.close_after = 10
+        handled = []
+        reason = scan_feed(page, handled.append, FeedEndDetector(window=1), sleep=lambda s: None)
+        self.assertEqual(reason, "page-error")
+        self.assertLess(len(handled), 23)
+
+    def test_primed_detector_counts_the_first_scroll(self):
+        det = FeedEndDetector(window=3)
+        det.prime(10, 500)
+        self.assertFalse(det.observe(10, 500))
+        self.assertFalse(det.observe(10, 500))
+        self.assertTrue(det.observe(10, 500))
+
+    def test_detector_reset_clears_the_streak(self):
+        det = FeedEndDetector(window=2)
+        det.observe(10, 500)
+        det.observe(10, 500)
+        det.reset()
+        self.assertFalse(det.observe(10, 500))
+        self.assertFalse(det.observe(10, 500))
+        self.assertTrue(det.observe(10, 500))
+
+if __name__ == "__main__":
+    unittest.main()
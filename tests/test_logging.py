@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+ProgressThrottle = web_mod.ProgressThrottle
+JsonLinesFormatter = web_mod.JsonLinesFormatter
+setup_logging = web_mod.setup_logging
+shutdown_logging = web_mod.shutdown_logging
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class LoggingTest(unittest.TestCase):
+    def test_progress_throttle(self):
+        clock = FakeClock()
+        throttle = ProgressThrottle(interval=5.0, clock=clock)
+        self.assertTrue(throttle.ready())
+        clock.now = 4.9
+        self.assertFalse(throttle.ready())
+        clock.now = 5.0
+        self.assertTrue(throttle.ready())
+        self.assertFalse(throttle.ready())
+
+    def test_json_lines_formatter_includes_extras(self):
+        rec = logging.LogRecord("fb_scraper", logging.INFO, __file__, 1, "[+] %s", ("a@x.com",), None)
+        rec.event = "email"
+        rec.email = "a@x.com"
+        data = json.loads(JsonLinesFormatter().format(rec))
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["msg"], "[+] a@x.com")
+        self.assertEqual((data["event"], data["email"]), ("email", "a@x.com"))
+        self.assertNotIn("lineno", data)
+
+    def test_queued_console_and_json_file(self):
+        out = io.StringIO()
+        old_stdout = sys.stdout
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "run.jsonl")
+            sys.stdout = out
+            try:
+                setup_logging("INFO", path)
+                logging.getLogger("fb_scraper").info("[+] a@x.com", extra={"event": "email", "email": "a@x.com"})
+                logging.getLogger("fb_scraper").debug("hidden")
+                shutdown_logging()
+                shutdown_logging()
+            finally:
+                sys.stdout = old_stdout
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(ln) for ln in f]
+        self.assertEqual(out.getvalue(), "[+] a@x.com\n")
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["email"], "a@x.com")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+PostRecord = web_mod.PostRecord
+EmailHit = web_mod.EmailHit
+HitBatch = web_mod.HitBatch
+
+class FakeElement:
+    def __init__(self, attrs=None):
+        self._attrs = attrs or {}
+
+    def get_attribute(self, name):
+        return self._attrs.get(name)
+
+    def locator(self, selector):
+        if selector == "a":
+            return FakeLocator(self._attrs.get("_anchors", []))
+        if selector == "abbr":
+            return FakeLocator(self._attrs.get("_abbrs", []))
+        return FakeLocator([])
+
+class FakeLocator:
+    def __init__(self, elements):
+        self._elements = elements
+
+    def count(self):
+        return len(self._elements)
+
+    def nth(self, i):
+        return self._elements[i]
+
+class RecordsTest(unittest.TestCase):
+    def test_post_record_from_post(self):
+        a1 = FakeElement(attrs={"href": "/jane.doe?ref=x", "data-hovercard": "/ajax/hovercard/user.php?id=42"})
+        a2 = FakeElement(attrs={"href": "https://web.facebook.com/groups/1/posts/987654321"})
+        ab = FakeElement(attrs={"data-utime": "1609459200"})
+        rec = PostRecord.from_post(FakeElement(attrs={"_anchors": [a1, a2], "_abbrs": [ab]}))
+        self.assertEqual(rec.post_id, "987654321")
+        self.assertEqual(rec.link, "https://web.facebook.com/jane.doe")
+        self.assertEqual(rec.author_username, "jane.doe")
+        self.assertEqual(rec.author_id, "42")
+        self.assertEqual(rec.post_date, "2021-01-01T00:00:00Z")
+
+    def test_records_have_no_instance_dict(self):
+        self.assertFalse(hasattr(EmailHit("a@x.com", "post", "", ""), "__dict__"))
+        self.assertFalse(hasattr(PostRecord("", "", "", "", "", ""), "__dict__"))
+        self.assertEqual(EmailHit("a@x.com", "post", "", "").domain, "x.com")
+
+    def test_batch_rows_hits_and_interning(self):
+        batch = HitBatch()
+        link = "".join(["https://web.facebook.com/", "groups/1"])  # built at runtime, not a literal
+        batch.add("a@x.com", "post", link, "1")
+        batch.append(EmailHit("b@x.com", "post", "".join(["https://web.facebook.com/", "groups/1"]), "1"))
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch.rows(), [("a@x.com", "post", link), ("b@x.com", "post", link)])
+        self.assertEqual(batch.hits()[1], EmailHit("b@x.com", "post", link, "1"))
+        self.assertIs(batch.links[0], batch.links[1])
+        self.assertIs(batch.domains[0], batch.domains[1])
+        batch.clear()
+        self.assertEqual(len(batch), 0)
+
+if __name__ == "__main__":
+    unittest.main()
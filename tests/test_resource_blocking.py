@@ -0,0 +1,107 @@
+import os
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+ResourceBlocker = web_mod.ResourceBlocker
+DEFAULT_BLOCKED_RESOURCES = web_mod.DEFAULT_BLOCKED_RESOURCES
+
+class FakeRequest:
+    def __init__(self, resource_type):
+        self.resource_type = resource_type
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = FakeRequest(resource_type)
+        self.outcome = None
+
+    def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+class BrokenRoute(FakeRoute):
+    @property
+    def request(self):
+        raise RuntimeError("target closed")
+
+    @request.setter
+    def request(self, value):
+        pass
+
+class FakeFinishedRequest:
+    def __init__(self, body, headers=100):
+        self._sizes = {"requestBodySize": 0, "requestHeadersSize": 50,
+                       "responseBodySize": body, "responseHeadersSize": headers}
+
+    def sizes(self):
+        if self._sizes["responseBodySize"] is None:
+            raise RuntimeError("request was aborted")
+        return self._sizes
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.listeners = {}
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+class ResourceBlockerTest(unittest.TestCase):
+    def test_aborts_configured_types_only(self):
+        blocker = ResourceBlocker(DEFAULT_BLOCKED_RESOURCES)
+        outcomes = {}
+        for rtype in ("document", "script", "xhr", "image", "media", "font"):
+            route = FakeRoute(rtype)
+            blocker(route)
+            outcomes[rtype] = route.outcome
+        self.assertEqual(outcomes, {"document": "continue", "script": "continue", "xhr": "continue",
+                                    "image": "abort", "media": "abort", "font": "abort"})
+        self.assertEqual(blocker.blocked["image"], 1)
+
+    def test_document_and_script_are_never_blocked(self):
+        blocker = ResourceBlocker(["Image", " document", "script", ""])
+        self.assertEqual(blocker.types, frozenset({"image"}))
+
+    def test_route_is_continued_when_request_lookup_fails(self):
+        route = BrokenRoute("image")
+        ResourceBlocker(["image"])(route)
+        self.assertEqual(route.outcome, "continue")
+
+    def test_no_listener_without_blocking_or_stats(self):
+        ctx = FakeContext()
+        blocker = ResourceBlocker([])
+        blocker.install(ctx)
+        self.assertEqual((ctx.routes, ctx.listeners), ([], {}))
+        self.assertIn("transfer not measured", blocker.summary())
+        ctx = FakeContext()
+        blocker = ResourceBlocker([], tally=True)
+        blocker.install(ctx)
+        self.assertEqual(ctx.routes, [])
+        ctx.listeners["requestfinished"](FakeFinishedRequest(1000))
+        self.assertIn("1 responses, 0.0 MB transferred", blocker.summary())
+
+    def test_install_routes_and_counts_bytes(self):
+        blocker = ResourceBlocker(["image"])
+        ctx = FakeContext()
+        blocker.install(ctx)
+        self.assertEqual(ctx.routes[0][0], "**/*")
+        for body in (1000, None, 500):
+            ctx.listeners["requestfinished"](FakeFinishedRequest(body))
+        self.assertEqual((blocker.responses, blocker.response_bytes, blocker.unsized), (3, 1700, 1))
+        self.assertIn("blocked: none", blocker.summary())
+        self.assertIn("RSS scraper 50 MB, browser 300 MB (renderers 200 MB)",
+                      blocker.summary((50e6, 300e6, 200e6)))
+
+if __name__ == "__main__":
+    unittest.main()
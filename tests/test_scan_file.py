@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+extract_emails = web_mod.extract_emails
+plan_shards = web_mod.plan_shards
+scan_file = web_mod.scan_file
+
+class ScanFileTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "dump.txt")
+        lines = []
+        for i in range(300):
+            lines.append(f"post {i} selling phones, inbox for price")
+            if i % 7 == 0:
+                lines.append(f"contact user{i}@gmail.com or")
+                # obfuscated email broken across lines, likely to straddle a shard edge
+                lines.append(f"alt{i} [at] yahoo")
+                lines.append("[dot] com today")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_shards_cover_file_on_line_boundaries(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        shards = plan_shards(self.path, shard_bytes=500)
+        self.assertGreater(len(shards), 5)
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], len(data))
+        for (a, b), (c, _) in zip(shards, shards[1:]):
+            self.assertEqual(b, c)
+            self.assertEqual(data[b - 1:b], b"\n")
+
+    def test_matches_whole_file_extraction(self):
+        with open(self.path, encoding="utf-8") as f:
+            expected = extract_emails(f.read())
+        self.assertIn("alt7@yahoo.com", expected)
+        for shard_bytes in (97, 500, 1 << 20):
+            self.assertEqual(scan_file(self.path, workers=1, shard_bytes=shard_bytes), expected)
+
+    def test_newline_free_file_is_still_sharded(self):
+        # minified-HTML style dump on a single line
+        parts = [f'<div class="p"><span>post {i}</span>' + (f"<a>user{i}@gmail.com</a>" if i % 5 == 0 else "") + "</div>"
+                 for i in range(2000)]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
+        size = os.path.getsize(self.path)
+        shards = plan_shards(self.path, shard_bytes=4096, snap=512)
+        self.assertGreater(len(shards), 10)
+        self.assertEqual((shards[0][0], shards[-1][1]), (0, size))
+        for a, b in shards:
+            self.assertLessEqual(b - a, 4096 + 512)
+        with open(self.path, encoding="utf-8") as f:
+            expected = extract_emails(f.read())
+        self.assertEqual(len(expected), 400)
+        self.assertEqual(scan_file(self.path, workers=1, shard_bytes=4096), expected)
+
+    def test_hard_cut_without_any_boundary(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("é" * 5000)
+        shards = plan_shards(self.path, shard_bytes=1001, snap=16)
+        self.assertGreater(len(shards), 5)
+        for a, b in shards:
+            self.assertLessEqual(b - a, 1001 + 16)
+            self.assertEqual(b % 2, 0)  # never splits the two-byte character
+
+    def test_process_pool(self):
+        with open(self.path, encoding="utf-8") as f:
+            expected = extract_emails(f.read())
+        self.assertEqual(scan_file(self.path, workers=2, shard_bytes=500), expected)
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        self.assertEqual(plan_shards(self.path), [])
+        self.assertEqual(scan_file(self.path, workers=1), [])
+
+if __name__ == "__main__":
+    unittest.main()
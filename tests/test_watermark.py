@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+
+from feed_fakes import FakeFeedPage
+
+# load the wrapper module (no space in filename) so tests are stable
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODULE_PATH = os.path.join(ROOT, "web_scrapper.py")
+_spec = importlib.util.spec_from_file_location("web_scraper_module", MODULE_PATH)
+web_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_mod)
+
+STOP_SCAN = web_mod.STOP_SCAN
+WatermarkStore = web_mod.WatermarkStore
+IncrementalScan = web_mod.IncrementalScan
+FeedEndDetector = web_mod.FeedEndDetector
+scan_feed = web_mod.scan_feed
+capture_for_run = web_mod.capture_for_run
+finish_incremental = web_mod.finish_incremental
+extract_post_id = web_mod.extract_post_id
+
+SOURCE = "https://web.facebook.com/groups/1"
+BASE_UTIME = 1609459200
+
+class FakePost:
+    def __init__(self, n, utime):
+        self._raw = {"attrs": {"data-ft": '{"top_level_post_id":"%d"}' % n},
+                     "a": [{"href": "https://web.facebook.com/groups/1/posts/%d" % n}],
+                     "abbr": [{"data-utime": str(utime)}], "time": []}
+
+    def evaluate(self, expression, arg=None):
+        return self._raw
+
+def fixture_feed(n_posts, batch=5):
+    """Newest-first feed of posts 1..n_posts (id and timestamp grow together)."""
+    return FakeFeedPage(0, batch=batch, posts=[FakePost(n, BASE_UTIME + 60 * n) for n in range(n_posts, 0, -1)])
+
+def run(page, store, stop_after=3):
+    """One incremental pass wired like main(); returns (reason, handled post ids)."""
+    incremental = IncrementalScan(store.get(SOURCE), stop_after=stop_after)
+    handled = []
+
+    def handle_post(post):
+        captured = capture_for_run(post, "", SOURCE, incremental=incremental)
+        if captured is STOP_SCAN:
+            return STOP_SCAN
+        handled.append(extract_post_id(captured))
+        return False
+
+    reason = scan_feed(page, handle_post, FeedEndDetector(window=2), sleep=lambda s: None)
+    finish_incremental(store, SOURCE, incremental, reason)
+    return reason, handled
+
+class WatermarkTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "watermarks.json")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_second_run_stops_after_the_new_posts(self):
+        reason, handled = run(fixture_feed(40), WatermarkStore(self.path))
+        self.assertEqual(reason, "end-of-feed")
+        self.assertEqual(len(handled), 40)
+
+        store = WatermarkStore(self.path)
+        self.assertEqual(store.get(SOURCE)["post_id"], "40")
+        reason, handled = run(fixture_feed(47), store, stop_after=3)
+        self.assertEqual(reason, "caught-up")
+        # the 7 new posts, then two old ones before the third old post in a row ends the run
+        self.assertEqual(handled, [str(n) for n in range(47, 40, -1)] + ["40", "39"])
+        self.assertEqual(WatermarkStore(self.path).get(SOURCE)["post_id"], "47")
+
+    def test_feed_dying_partway_keeps_the_watermark(self):
+        run(fixture_feed(40), WatermarkStore(self.path))
+        page = fixture_feed(60)
+        page.close_after = 10  # browser dies while only the 20 new posts are partly read
+        reason, handled = run(page, WatermarkStore(self.path))
+        self.assertEqual(reason, "page-error")
+        self.assertLess(len(handled), 20)
+        self.assertEqual(WatermarkStore(self.path).get(SOURCE)["post_id"], "40")
+        # the next run still reaches every post the dead one never saw
+        reason, handled = run(fixture_feed(60), WatermarkStore(self.path))
+        self.assertEqual(reason, "caught-up")
+        self.assertEqual(handled[:20], [str(n) for n in range(60, 40, -1)])
+        self.assertEqual(WatermarkStore(self.path).get(SOURCE)["post_id"], "60")
+
+    def test_watermarks_are_per_source(self):
+        store = WatermarkStore(self.path)
+        store.set("https://web.facebook.com/groups/2", {"post_id": "999", "post_date": "", "updated": ""})
+        run(fixture_feed(10), store)
+        store = WatermarkStore(self.path)
+        self.assertEqual(store.get(SOURCE)["post_id"], "10")
+        self.assertEqual(store.get("https://web.facebook.com/groups/2")["post_id"], "999")
+
+    def test_pinned_old_post_does_not_end_the_run(self):
+        inc = IncrementalScan({"post_id": "40", "post_date": "2021-01-01T00:40:00Z"}, stop_after=2)
+        self.assertFalse(inc.observe("5", "2021-01-01T00:05:00Z"))   # pinned
+        self.assertFalse(inc.observe("45", "2021-01-01T00:45:00Z"))
+        self.assertFalse(inc.observe("40", "2021-01-01T00:40:00Z"))
+        self.assertTrue(inc.observe("39", "2021-01-01T00:39:00Z"))
+        self.assertEqual(inc.new_posts, 1)
+        self.assertEqual(inc.mark()["post_id"], "45")
+        self.assertEqual(inc.mark()["post_date"], "2021-01-01T00:45:00Z")
+
+    def test_falls_back_to_post_id_without_comparable_dates(self):
+        inc = IncrementalScan({"post_id": "40", "post_date": ""}, stop_after=1)
+        self.assertFalse(inc.observe("41", "2 hrs"))
+        self.assertTrue(inc.observe("40", "3 hrs"))
+
+    def test_no_watermark_never_stops(self):
+        inc = IncrementalScan(None, stop_after=1)
+        self.assertFalse(any(inc.observe(str(n), "") for n in range(10, 0, -1)))
+        self.assertEqual(inc.mark()["post_id"], "10")
+        self.assertEqual(inc.mark()["post_date"], "")
+
+if __name__ == "__main__":
+    unittest.main()
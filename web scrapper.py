@@ -1,7 +1,77 @@
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-import argparse, csv, os, re, sys, time, urllib.parse
+import argparse, atexit, csv, gzip, hashlib, html, json, logging, logging.handlers, mmap, os, queue, re, sys, time, urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter, OrderedDict, deque, namedtuple
+from datetime import datetime, timezone
 
 DEFAULT_TIMEOUT = 30000  # milliseconds
+POSTS_SELECTOR = "div[data-ad-preview='message'], article"
+PROFILE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile_cache.json")
+
+LOGGER_NAME = "fb_scraper"
+log = logging.getLogger(LOGGER_NAME)
+_log_listener = None
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, msg plus any `extra` fields."""
+
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "level": record.levelname, "msg": record.getMessage()}
+        for k, v in record.__dict__.items():
+            if k not in self._RESERVED:
+                data[k] = v
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+def setup_logging(level="INFO", log_file=""):
+    """
+    Route the scraper logger through a queue so the scan loop never blocks on stdout.
+    Console lines (and the optional JSON-lines `log_file`) are written by a background
+    QueueListener thread, drained by shutdown_logging() at interpreter exit.
+    """
+    q = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers = [console]
+    if log_file:
+        fh = logging.FileHandler(log_file, encoding="utf-8")
+        fh.setFormatter(JsonLinesFormatter())
+        handlers.append(fh)
+    global _log_listener
+    shutdown_logging()
+    _log_listener = logging.handlers.QueueListener(q, *handlers)
+    log.handlers[:] = [logging.handlers.QueueHandler(q)]
+    log.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    log.propagate = False
+    _log_listener.start()
+    return _log_listener
+
+def shutdown_logging():
+    """Drain queued log records and stop the writer thread (safe to call repeatedly)."""
+    global _log_listener
+    listener, _log_listener = _log_listener, None
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+atexit.register(shutdown_logging)
+
+class ProgressThrottle:
+    """Lets a repeating progress line through at most once per `interval` seconds."""
+
+    def __init__(self, interval=5.0, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._last = None
+
+    def ready(self):
+        now = self.clock()
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
 
 def get_non_colliding_filename(base_name, directory=None):
     """
@@ -33,6 +103,7 @@ def extract_emails(text):
 
     Strategy:
     - Normalize text (HTML-unescape, remove zero-width spaces).
+    - Keep only the windows around "at" anchors (locate_candidate_windows).
     - First collect obvious candidates via a liberal regex.
     - Collect obfuscated candidates via dedicated patterns.
     - Normalize candidate strings (replace dot/at tokens) and strip surrounding punctuation.
@@ -40,14 +111,18 @@ def extract_emails(text):
     """
     if not text:
         return []
+    return extract_emails_windowed(normalize_text(text))
 
-    import html as _html
-
-    # normalize common nuisances
-    s = _html.unescape(text)
+def normalize_text(text):
+    """HTML-unescape and strip zero-width / non-breaking spaces (the form extract_emails scans)."""
+    if not text:
+        return ""
+    s = html.unescape(text)
     s = s.replace('\u200b', '')  # remove zero-width spaces
     s = s.replace('\u00A0', ' ')  # non-breaking spaces -> space
+    return s
 
+def _extract_from_normalized(s):
     # validator: reasonably strict but practical (allows + addressing, quoted local parts)
     strict_re = re.compile(
         r'^(?:"[^"]+"|[A-Za-z0-9!#$%&\'*+/=?^_`{|}~\.-]{1,64})@'
@@ -118,6 +193,289 @@ def extract_emails(text):
     # return deterministic sorted list
     return sorted(cleaned)
 
+# every email form extract_emails accepts contains one of these "at" anchors; the
+# "[dot]"/"(dot)"/" dot " tokens only ever follow one, inside the domain chain
+_ANCHOR_RE = re.compile(r'@|\[at\]|\(at\)|\sat(?=\s)', flags=re.IGNORECASE)
+# domain chain to the right of an anchor (superset of what the finders can consume)
+_DOMAIN_CHAIN_RE = re.compile(
+    r'\s*(?:[\w\-.]+|\[dot\]|\(dot\)|\s+(?=dot\s|[.\[(])|(?<=[.\])])\s+|(?<=\sdot)\s+)*',
+    flags=re.IGNORECASE
+)
+_WS_RE = re.compile(r'\s')
+# longest local part the finders accept, plus slack for the separator before the anchor
+_LOCAL_REACH = 64 + 4
+
+def _window_start(s, pos, floor=0):
+    # skip whitespace before the anchor, then the longest possible local part, then
+    # back off to the preceding whitespace so word boundaries match the full-text scan.
+    # Reaching `floor` (the previous window's end) means the windows merge anyway, so the
+    # walk stops there; without it a long run without whitespace is walked once per anchor.
+    while pos > floor and s[pos - 1].isspace():
+        pos -= 1
+    pos = max(floor, pos - _LOCAL_REACH)
+    while pos > floor and not s[pos - 1].isspace():
+        pos -= 1
+    return max(0, pos - 1)
+
+def locate_candidate_windows(s):
+    """
+    Find every "at" anchor (@, [at], (at), " at ") in one pass over normalized text and
+    return merged (start, end) windows that contain every possible email match around them.
+    """
+    windows = []
+    # the whitespace search after a domain chain is shared by anchors that end before the
+    # same whitespace: no whitespace lies in [ws_from, ws_end - 1)
+    ws_from, ws_end = -1, -1
+    for m in _ANCHOR_RE.finditer(s):
+        start = _window_start(s, m.start(), windows[-1][1] if windows else 0)
+        pos = _DOMAIN_CHAIN_RE.match(s, m.end()).end()
+        if not ws_from <= pos < ws_end:
+            ws = _WS_RE.search(s, pos)
+            ws_from, ws_end = pos, (ws.end() if ws else len(s) + 1)
+        end = min(ws_end, len(s))
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return [(a, b) for a, b in windows]
+
+def extract_emails_windowed(s):
+    """
+    extract_emails over normalized text, running the full regex pipeline only on the
+    windows around anchor tokens. Windows are joined with NUL, which no finder matches.
+    """
+    windows = locate_candidate_windows(s)
+    if not windows:
+        return []
+    return _extract_from_normalized("\x00".join(s[a:b] for a, b in windows))
+
+# bump whenever extract_emails rules change so cached results are not served stale
+EXTRACT_ENGINE_VERSION = "1"
+
+def load_cache(path=PROFILE_CACHE_FILE):
+    """Load a JSON dict cache from `path`; returns {} if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def save_cache(cache, path=PROFILE_CACHE_FILE):
+    """Write a JSON dict cache to `path` atomically (tmp file + replace)."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+class ExtractionCache:
+    """
+    LRU cache mapping a blake2b-64 hash of normalized post text to extract_emails results.
+
+    - size-bounded: least recently used entries are evicted past `max_entries`
+    - keys include EXTRACT_ENGINE_VERSION, and a persisted file written by another
+      engine version is discarded on load
+    - optional on-disk persistence via load_cache/save_cache (`path`)
+    """
+
+    def __init__(self, max_entries=50000, path=None, engine_version=EXTRACT_ENGINE_VERSION):
+        self.max_entries = max(1, int(max_entries))
+        self.path = path
+        self.engine_version = engine_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        if path:
+            self.load()
+
+    def key(self, normalized):
+        h = hashlib.blake2b(digest_size=8, person=self.engine_version.encode("utf-8")[:16])
+        h.update(normalized.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def extract(self, text):
+        """Cached equivalent of extract_emails(text)."""
+        if not text:
+            return []
+        s = normalize_text(text)
+        k = self.key(s)
+        res = self._entries.get(k)
+        if res is not None:
+            self._entries.move_to_end(k)
+            self.hits += 1
+            return list(res)
+        self.misses += 1
+        res = extract_emails_windowed(s)
+        self._entries[k] = tuple(res)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return res
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def load(self):
+        data = load_cache(self.path)
+        if data.get("engine") != self.engine_version:
+            return
+        for k, v in (data.get("entries") or {}).items():
+            self._entries[k] = tuple(v)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        if not self.path:
+            return
+        save_cache({"engine": self.engine_version,
+                    "entries": {k: list(v) for k, v in self._entries.items()}}, self.path)
+
+def get_safe_filename(name, default="output"):
+    """Turn an arbitrary string (URL, group name) into a filesystem-safe file stem."""
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', name or "").strip("._")
+    return name[:120] or default
+
+def get_gender_for_profile(profile_href, cache=None):
+    """Return the cached gender label for a profile href ('' when unknown)."""
+    if not profile_href:
+        return ""
+    if cache is None:
+        cache = load_cache()
+    return cache.get(profile_href, "") or ""
+
+# path segments that are never a post author's profile
+_NON_PROFILE_SEGMENTS = {
+    "groups", "watch", "photo", "photo.php", "photos", "events", "pages", "hashtag",
+    "story.php", "permalink.php", "search", "marketplace", "reel", "reels", "stories",
+    "sharer", "sharer.php", "login", "notifications", "messages", "friends", "gaming",
+    "help", "policies", "privacy", "settings", "bookmarks", "ads", "l.php",
+}
+
+def _iter_anchor_attrs(node, name):
+    try:
+        anchors = node.locator("a")
+        for i in range(anchors.count()):
+            try:
+                val = anchors.nth(i).get_attribute(name)
+            except Exception:
+                val = None
+            if val:
+                yield val
+    except Exception:
+        return
+
+def _normalize_fb_href(href):
+    if href.startswith("/"):
+        href = "https://web.facebook.com" + href
+    return href
+
+def extract_post_id(post):
+    """Best-effort post id from data-ft JSON, permalink anchors or numeric element ids."""
+    try:
+        ft = post.get_attribute("data-ft")
+    except Exception:
+        ft = None
+    if ft:
+        try:
+            data = json.loads(ft)
+            pid = data.get("top_level_post_id") or data.get("mf_story_key")
+            if pid:
+                return str(pid)
+        except Exception:
+            m = re.search(r'"top_level_post_id"\s*:\s*"?(\d+)', ft)
+            if m:
+                return m.group(1)
+    for href in _iter_anchor_attrs(post, "href"):
+        for pat in (r'story_fbid=(\d+)', r'/posts/(\d+)', r'/permalink/(\d+)', r'[?&]fbid=(\d+)'):
+            m = re.search(pat, href)
+            if m:
+                return m.group(1)
+    for attr in ("id", "data-post-id", "data-testid"):
+        try:
+            val = post.get_attribute(attr)
+        except Exception:
+            val = None
+        if val:
+            m = re.search(r'(\d{5,})', val)
+            if m:
+                return m.group(1)
+    return ""
+
+def extract_author_profile_href(post):
+    """First anchor that looks like a personal profile, normalized to an absolute URL."""
+    for href in _iter_anchor_attrs(post, "href"):
+        href = _normalize_fb_href(href)
+        parsed = urllib.parse.urlparse(href)
+        if "facebook.com" not in parsed.netloc:
+            continue
+        segs = [seg for seg in parsed.path.split("/") if seg]
+        if not segs:
+            continue
+        if segs[0] == "profile.php":
+            uid = urllib.parse.parse_qs(parsed.query).get("id", [""])[0]
+            if uid:
+                return f"https://web.facebook.com/profile.php?id={uid}"
+            continue
+        if segs[0].lower() in _NON_PROFILE_SEGMENTS:
+            continue
+        return f"https://web.facebook.com/{segs[0]}"
+    return ""
+
+def extract_author_username(post):
+    """Vanity username of the post author ('' for numeric profile.php profiles)."""
+    href = extract_author_profile_href(post)
+    if not href or "profile.php" in href:
+        return ""
+    return href.rstrip("/").rsplit("/", 1)[-1]
+
+def extract_author_id(post):
+    """Numeric author id from profile.php?id= links or data-hovercard attributes."""
+    for href in _iter_anchor_attrs(post, "href"):
+        m = re.search(r'profile\.php\?(?:[^#]*&)?id=(\d+)', href)
+        if m:
+            return m.group(1)
+    for hc in _iter_anchor_attrs(post, "data-hovercard"):
+        m = re.search(r'[?&]id=(\d+)', hc)
+        if m:
+            return m.group(1)
+    return ""
+
+def extract_post_date(post):
+    """Post timestamp: abbr[data-utime] as ISO-8601 UTC, else time[datetime], else anchor title."""
+    try:
+        abbrs = post.locator("abbr")
+        for i in range(abbrs.count()):
+            ut = abbrs.nth(i).get_attribute("data-utime")
+            if ut and ut.isdigit():
+                return datetime.fromtimestamp(int(ut), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except Exception:
+        pass
+    try:
+        times = post.locator("time")
+        for i in range(times.count()):
+            dt = times.nth(i).get_attribute("datetime")
+            if dt:
+                return dt
+    except Exception:
+        pass
+    for title in _iter_anchor_attrs(post, "title"):
+        return title
+    return ""
+
 def get_first_post_link(post):
     try:
         anchors = post.locator("a")
@@ -137,19 +495,959 @@ def get_first_post_link(post):
         pass
     return ""
 
+SEE_MORE_SELECTOR = "text=/see more/i"
+# collapsed captions end in an ellipsis and/or carry the "See more" link text
+_TRUNCATED_RE = re.compile(r'…|\.\.\.|\bsee more\b', flags=re.IGNORECASE)
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[int(q * (len(ordered) - 1))]
+
+class ExpansionBudget:
+    """
+    Per-run time budget for reading a post's text.
+    Waits after a "See more" click and the inner_text timeout are sized from the
+    latencies observed so far in this run instead of fixed 400 ms / 2500 ms values.
+    """
+
+    def __init__(self, wait_ms=400, min_wait_ms=100, max_wait_ms=1500,
+                 text_timeout_ms=2500, min_text_timeout_ms=500,
+                 post_budget_ms=2500, max_clicks=4, window=50, clock=time.monotonic):
+        self.initial_wait_ms = wait_ms
+        self.min_wait_ms = min_wait_ms
+        self.max_wait_ms = max_wait_ms
+        self.initial_text_timeout_ms = text_timeout_ms
+        self.min_text_timeout_ms = min_text_timeout_ms
+        self.post_budget_ms = post_budget_ms
+        self.max_clicks = max_clicks
+        self.clock = clock
+        self.expand_ms = deque(maxlen=window)
+        self.text_ms = deque(maxlen=window)
+        self.expanded = 0
+        self.skipped = 0
+        self.text_retries = 0
+        self.unreadable = 0
+        self.stalled = 0
+        # raised by back-to-back stalls so a page that slows down mid-run is waited for again
+        self.floor_ms = 0.0
+        self._stall_run = 0
+
+    @staticmethod
+    def looks_truncated(text):
+        return bool(text) and bool(_TRUNCATED_RE.search(text))
+
+    def wait_ms(self):
+        """How long to wait for a clicked post to change: 2x the p90 expansion latency, or the stall floor."""
+        if len(self.expand_ms) < 5:
+            learned = self.initial_wait_ms
+        else:
+            learned = max(self.min_wait_ms, 2 * _percentile(self.expand_ms, 0.9))
+        return int(min(self.max_wait_ms, max(learned, self.floor_ms)))
+
+    def text_timeout_ms(self):
+        """inner_text timeout: 3x the p95 read latency, never above the initial timeout."""
+        if len(self.text_ms) < 5:
+            return self.initial_text_timeout_ms
+        return int(min(self.initial_text_timeout_ms,
+                       max(self.min_text_timeout_ms, 3 * _percentile(self.text_ms, 0.95))))
+
+    def observe_expand(self, ms, changed):
+        # a lone stall is usually a "See more" that never expands; stalls in a row mean the
+        # page got slower than the learned cap, so the floor doubles until clicks land again
+        # and only decays once expansions finish well inside it
+        if changed:
+            self.expand_ms.append(ms)
+            self.expanded += 1
+            self._stall_run = 0
+            if ms < self.floor_ms / 2:
+                self.floor_ms *= 0.8
+        else:
+            self.stalled += 1
+            self._stall_run += 1
+            if self._stall_run >= 2:
+                self.floor_ms = min(self.max_wait_ms, 2 * max(ms, self.floor_ms))
+
+    def observe_text(self, ms):
+        self.text_ms.append(ms)
+
+def _read_inner_text(post, budget):
+    # a read that outlives the learned timeout is retried once with the initial timeout; its
+    # slow sample is what lets text_timeout_ms() grow again. None when both attempts fail.
+    timeouts = [budget.text_timeout_ms()]
+    if timeouts[0] < budget.initial_text_timeout_ms:
+        timeouts.append(budget.initial_text_timeout_ms)
+    for attempt, timeout in enumerate(timeouts):
+        t0 = budget.clock()
+        try:
+            text = post.inner_text(timeout=timeout) or ""
+        except Exception:
+            continue
+        budget.observe_text((budget.clock() - t0) * 1000)
+        budget.text_retries += attempt
+        return text
+    budget.unreadable += 1
+    return None
+
+def _wait_for_text_change(page, post, before_len, timeout_ms):
+    # before_len is in UTF-16 code units, matching the browser's innerText.length
+    handle = None
+    try:
+        handle = post.element_handle(timeout=timeout_ms)
+        page.wait_for_function("([el, n]) => !el.isConnected || el.innerText.length !== n",
+                               arg=[handle, before_len], timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+    finally:
+        # release the renderer-side reference; handles otherwise pile up for the whole run
+        if handle is not None:
+            try:
+                handle.dispose()
+            except Exception:
+                pass
+
+def read_post_text(page, post, budget):
+    """
+    Return a post's visible text, clicking "See more" only while the text looks truncated.
+    After each click, waits for the post's text to change (capped by budget.wait_ms()) and
+    gives up on a post whose click changes nothing or whose time budget is spent.
+    """
+    start = budget.clock()
+    text = _read_inner_text(post, budget)
+    if text is None:
+        return ""
+    if not budget.looks_truncated(text):
+        budget.skipped += 1
+        return text
+    for _ in range(budget.max_clicks):
+        if not budget.looks_truncated(text) or (budget.clock() - start) * 1000 >= budget.post_budget_ms:
+            break
+        try:
+            btns = post.locator(SEE_MORE_SELECTOR)
+            if not btns.count():
+                break
+            t0 = budget.clock()
+            btns.first.click(timeout=budget.text_timeout_ms())
+            changed = _wait_for_text_change(page, post, len(text.encode("utf-16-le")) // 2, budget.wait_ms())
+        except Exception:
+            break
+        budget.observe_expand((budget.clock() - t0) * 1000, changed)
+        if not changed:
+            break
+        text = _read_inner_text(post, budget) or text
+    return text
+
+# text a finished feed or search shows below its last post (matched case-insensitively)
+FEED_END_MARKERS = ("end of results", "no more posts", "no more results", "you're all caught up")
+
+# walks text nodes backwards from the end of the page (about the last 20k characters),
+# skipping <script>/<style> payloads, and only counts a marker whose element is rendered
+_FEED_STATE_JS = """(markers) => {
+    const el = document.scrollingElement || document.documentElement;
+    const body = document.body;
+    let shown = false;
+    if (body) {
+        const walker = document.createTreeWalker(body, NodeFilter.SHOW_TEXT);
+        let node = walker.lastChild(), budget = 20000;
+        while (node && budget > 0 && !shown) {
+            const parent = node.parentElement;
+            if (parent && !/^(SCRIPT|STYLE|NOSCRIPT|TEMPLATE)$/.test(parent.tagName)) {
+                const text = node.data.toLowerCase();
+                budget -= text.length;
+                if (markers.some(m => text.includes(m))) {
+                    shown = parent.checkVisibility ? parent.checkVisibility({visibilityProperty: true})
+                                                   : parent.getClientRects().length > 0;
+                }
+            }
+            node = walker.previousNode();
+        }
+    }
+    return [el ? el.scrollHeight : 0, shown];
+}"""
+
+class FeedEndDetector:
+    """
+    Decides when the feed is exhausted. Primed with the state before the first fruitless
+    scroll and fed one observation per fruitless scroll, it reports the end once `window`
+    scrolls in a row left both the post count and the document height unchanged, or after
+    `marker_window` such scrolls while an end-of-results marker is shown.
+    """
+
+    def __init__(self, window=3, marker_window=1):
+        self.window = max(1, int(window))
+        self.marker_window = max(1, min(int(marker_window), self.window))
+        self.stable = 0
+        self._last = None
+
+    def observe(self, post_count, height, end_marker=False):
+        state = (post_count, height)
+        self.stable = self.stable + 1 if state == self._last else 0
+        self._last = state
+        return self.stable >= (self.marker_window if end_marker else self.window)
+
+    @property
+    def primed(self):
+        return self._last is not None
+
+    def prime(self, post_count, height):
+        """Record the state before a scroll, so the first scroll is already compared."""
+        self._last = (post_count, height)
+
+    def reset(self):
+        """Forget the streak, e.g. after a failed page read (an error is not a stable feed)."""
+        self.stable = 0
+        self._last = None
+
+def feed_state(page, markers=FEED_END_MARKERS):
+    """(document height, end-of-results marker visible) in one round trip; None if the page can't be read."""
+    try:
+        height, end = page.evaluate(_FEED_STATE_JS, list(markers))
+        return int(height or 0), bool(end)
+    except Exception:
+        return None
+
+def _scroll_feed(page):
+    try:
+        page.mouse.wheel(0, 3000)
+    except Exception:
+        try:
+            page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        except Exception:
+            pass
+
+def _wait_for_more_posts(page, posts_selector, count, timeout_ms):
+    try:
+        page.wait_for_function("([sel, n]) => document.querySelectorAll(sel).length > n",
+                               arg=[posts_selector, count], timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+# handle_post's return value asking scan_feed to stop (e.g. incremental run caught up)
+STOP_SCAN = object()
+
+def scan_feed(page, handle_post, end_detector, posts_selector=POSTS_SELECTOR, on_round=None,
+              progress=None, max_scrolls=60, scroll_wait_ms=1000, max_page_errors=3, sleep=time.sleep):
+    """
+    Walk the feed, calling handle_post(post) once per post in page order and on_round()
+    after each batch. When a round brings no new posts the page is scrolled and given up
+    to scroll_wait_ms to grow; the scan stops when end_detector reports the feed exhausted,
+    after max_scrolls fruitless scrolls in a row, when handle_post returns STOP_SCAN, or
+    with "page-error" once max_page_errors reads of the post count or page height in a row
+    fail (page closed, browser crashed). Returns why it stopped.
+    """
+    last_index = 0
+    scroll_attempts = 0
+    page_errors = 0
+    while True:
+        try:
+            # refresh locator and count
+            posts = page.locator(posts_selector)
+            try:
+                count = posts.count()
+            except Exception:
+                count = None
+            if count is None:
+                end_detector.reset()
+                page_errors += 1
+                if page_errors >= max_page_errors:
+                    return "page-error"
+                sleep(0.8)
+                continue
+
+            # progress line (before processing new posts), rate-limited unless --log-level DEBUG
+            if progress is not None and (log.isEnabledFor(logging.DEBUG) or (log.isEnabledFor(logging.INFO) and progress.ready())):
+                log.info(f"[*] progress: total_posts={count} scanned_until={last_index} scroll_attempts={scroll_attempts}",
+                         extra={"event": "progress", "total_posts": count, "scanned_until": last_index})
+
+            caught_up = False
+            for i in range(last_index, count):
+                try:
+                    if handle_post(posts.nth(i)) is STOP_SCAN:
+                        caught_up = True
+                        break
+                except Exception:
+                    continue
+            if on_round is not None:
+                on_round()
+            if caught_up:
+                return "caught-up"
+
+            if count > last_index:
+                last_index = count
+                scroll_attempts = 0
+                page_errors = 0
+                end_detector.reset()
+                # small pause to allow lazy-load
+                sleep(0.6)
+                continue
+
+            # nothing new: scroll, wait for more posts, and check whether the feed is done
+            if not end_detector.primed:
+                state = feed_state(page)
+                if state is not None:
+                    end_detector.prime(count, state[0])
+            _scroll_feed(page)
+            scroll_attempts += 1
+            if _wait_for_more_posts(page, posts_selector, count, scroll_wait_ms):
+                continue
+            state = feed_state(page)
+            if state is None:
+                end_detector.reset()
+                page_errors += 1
+                if page_errors >= max_page_errors:
+                    return "page-error"
+            else:
+                page_errors = 0
+                if end_detector.observe(count, *state):
+                    return "end-of-feed"
+            if scroll_attempts >= max_scrolls:
+                return "max-scrolls"
+
+        except KeyboardInterrupt:
+            log.warning("[!] Interrupted by user.")
+            return "interrupted"
+        except Exception:
+            # best-effort continue
+            try:
+                page.mouse.wheel(0, 2000)
+            except Exception:
+                pass
+            sleep(0.8)
+
+# --incremental: per-source watermark of the newest post processed by a completed run
+WATERMARK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "watermarks.json")
+
+def _parse_post_time(value):
+    """Epoch seconds for an ISO-8601 post date ('' / relative text like '2 hrs' -> None)."""
+    if not value:
+        return None
+    v = value.strip()
+    if v.endswith("Z"):
+        v = v[:-1] + "+00:00"
+    v = re.sub(r'([+-]\d{2})(\d{2})$', r'\1:\2', v)
+    try:
+        dt = datetime.fromisoformat(v)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def _numeric_id(post_id):
+    return int(post_id) if post_id and post_id.isdigit() else None
+
+class WatermarkStore:
+    """Newest processed post per source (start URL), persisted with load_cache/save_cache."""
+
+    def __init__(self, path=WATERMARK_FILE):
+        self.path = path
+        self.data = load_cache(path)
+
+    def get(self, source):
+        return self.data.get(source)
+
+    def set(self, source, mark):
+        self.data[source] = mark
+
+    def save(self):
+        save_cache(self.data, self.path)
+
+class IncrementalScan:
+    """
+    Compares each post against the previous run's watermark (by post date when both sides
+    have one, else by numeric post id) and reports "caught up" after `stop_after` old posts
+    in a row, so one pinned or out-of-order post does not end the run. Also tracks the
+    newest post of this run for the next watermark.
+    """
+
+    def __init__(self, previous=None, stop_after=3):
+        previous = previous or {}
+        self.prev_time = _parse_post_time(previous.get("post_date", ""))
+        self.prev_id = _numeric_id(previous.get("post_id", ""))
+        self.stop_after = max(1, int(stop_after))
+        self.old_streak = 0
+        self.new_posts = 0
+        self.newest_time = self.prev_time
+        self.newest_id = self.prev_id
+
+    def is_old(self, post_id, post_date):
+        t = _parse_post_time(post_date)
+        if t is not None and self.prev_time is not None:
+            return t <= self.prev_time
+        n = _numeric_id(post_id)
+        if n is not None and self.prev_id is not None:
+            return n <= self.prev_id
+        return False
+
+    def observe(self, post_id, post_date):
+        """Record one post in feed order; True once the scan has reached already-seen posts."""
+        if self.is_old(post_id, post_date):
+            self.old_streak += 1
+            return self.old_streak >= self.stop_after
+        self.old_streak = 0
+        self.new_posts += 1
+        t = _parse_post_time(post_date)
+        if t is not None and (self.newest_time is None or t > self.newest_time):
+            self.newest_time = t
+        n = _numeric_id(post_id)
+        if n is not None and (self.newest_id is None or n > self.newest_id):
+            self.newest_id = n
+        return False
+
+    def mark(self):
+        """Watermark entry for this run (falls back to the previous values where nothing newer was seen)."""
+        return {
+            "post_id": str(self.newest_id) if self.newest_id is not None else "",
+            "post_date": (datetime.fromtimestamp(self.newest_time, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                          if self.newest_time is not None else ""),
+            "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+# scan_feed stop reasons after which everything down to the old watermark was seen
+WATERMARK_STOPS = ("caught-up", "end-of-feed")
+
+def capture_for_run(post, text, source, archive=None, incremental=None):
+    """
+    The scan loop's per-post --archive / --incremental step: captures the post once, appends
+    it to `archive` and checks it against the watermark. Returns STOP_SCAN once the
+    incremental scan has caught up, else the CapturedPost (None when neither is enabled).
+    """
+    if archive is None and incremental is None:
+        return None
+    captured = CapturedPost(capture_post(post, text, source=source))
+    if archive is not None:
+        archive.append(captured.payload)
+    if incremental is not None and incremental.observe(extract_post_id(captured), extract_post_date(captured)):
+        return STOP_SCAN
+    return captured
+
+def finish_incremental(store, source, incremental, reason):
+    """Save this run's watermark for `source` if the scan stopped for a WATERMARK_STOPS reason; returns whether it did."""
+    if reason not in WATERMARK_STOPS:
+        return False
+    store.set(source, incremental.mark())
+    store.save()
+    return True
+
+# Playwright resource types aborted by --block-resources when given without a value
+DEFAULT_BLOCKED_RESOURCES = ("image", "media", "font")
+# never blocked: the feed is rendered by the document and its scripts
+_REQUIRED_RESOURCES = frozenset({"document", "script"})
+
+def process_rss():
+    """
+    Resident memory in bytes as (this process, its child processes, renderer processes):
+    the children are the Playwright driver, the browser and its renderers. Needs the
+    optional psutil package; returns None without it.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    me = psutil.Process()
+    own = me.memory_info().rss
+    children = renderers = 0
+    for child in me.children(recursive=True):
+        try:
+            rss = child.memory_info().rss
+            is_renderer = "--type=renderer" in child.cmdline()
+        except psutil.Error:
+            continue
+        children += rss
+        if is_renderer:
+            renderers += rss
+    return own, children, renderers
+
+class ResourceBlocker:
+    """
+    Context-wide route handler that aborts requests of the given resource types
+    (image, media, font, stylesheet, ...) and tallies what the page still downloads.
+    The tally costs a sizes() round trip per request, so it is only installed when
+    something is blocked or tally=True asks for it.
+    """
+
+    def __init__(self, types=(), tally=False):
+        self.types = frozenset(t.strip().lower() for t in types if t.strip()) - _REQUIRED_RESOURCES
+        self.tally = bool(tally or self.types)
+        self.blocked = Counter()
+        self.responses = 0
+        self.response_bytes = 0
+        self.unsized = 0
+
+    def __call__(self, route):
+        try:
+            rtype = route.request.resource_type
+            if rtype in self.types:
+                self.blocked[rtype] += 1
+                route.abort("blockedbyclient")
+                return
+        except Exception:
+            pass
+        # anything not aborted must be continued, or the request hangs
+        try:
+            route.continue_()
+        except Exception:
+            pass
+
+    def _on_request_finished(self, request):
+        # bytes on the wire (encoded body + headers); content-length is absent on chunked
+        # and most compressed responses
+        self.responses += 1
+        try:
+            sizes = request.sizes()
+            self.response_bytes += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            self.unsized += 1
+
+    def install(self, ctx):
+        if self.tally:
+            ctx.on("requestfinished", self._on_request_finished)
+        if self.types:
+            ctx.route("**/*", self)
+
+    def summary(self, rss=None):
+        blocked = ", ".join(f"{t}={n}" for t, n in sorted(self.blocked.items())) or "none"
+        unsized = f" ({self.unsized} unsized)" if self.unsized else ""
+        if rss is None:
+            mem = "RSS n/a (install psutil)"
+        else:
+            own, children, renderers = rss
+            mem = f"RSS scraper {own / 1e6:,.0f} MB, browser {children / 1e6:,.0f} MB (renderers {renderers / 1e6:,.0f} MB)"
+        if not self.tally:
+            return f"transfer not measured (use --network-stats); blocked: {blocked}; {mem}"
+        return (f"{self.responses} responses, {self.response_bytes / 1e6:,.1f} MB transferred{unsized}; "
+                f"blocked: {blocked}; {mem}")
+
+# --archive / --replay: raw post captures for re-extraction without re-scraping
+ARCHIVE_VERSION = 1
+ARCHIVE_CHUNK_RECORDS = 256  # posts per gzip member
+
+_CAPTURE_JS = """(el) => {
+    const pick = (e, names) => {
+        const o = {};
+        for (const n of names) { const v = e.getAttribute(n); if (v !== null) o[n] = v; }
+        return o;
+    };
+    const all = (sel, names) => Array.from(el.querySelectorAll(sel), e => pick(e, names));
+    return {
+        attrs: pick(el, ["id", "data-ft", "data-post-id", "data-testid"]),
+        a: all("a", ["href", "title", "data-hovercard"]),
+        abbr: all("abbr", ["data-utime", "title"]),
+        time: all("time", ["datetime"]),
+    };
+}"""
+
+def capture_post(post, text, source=""):
+    """Raw payload of one post: its text plus the attributes the parsers read, in one round trip."""
+    try:
+        raw = post.evaluate(_CAPTURE_JS) or {}
+    except Exception:
+        raw = {}
+    return {"v": ARCHIVE_VERSION, "ts": round(time.time(), 3), "src": source, "text": text or "",
+            "attrs": raw.get("attrs") or {}, "a": raw.get("a") or [],
+            "abbr": raw.get("abbr") or [], "time": raw.get("time") or []}
+
+class _CapturedNode:
+    def __init__(self, attrs):
+        self._attrs = attrs
+
+    def get_attribute(self, name):
+        return self._attrs.get(name)
+
+class _CapturedLocator:
+    def __init__(self, nodes):
+        self._nodes = nodes
+
+    def count(self):
+        return len(self._nodes)
+
+    def nth(self, i):
+        return self._nodes[i]
+
+    @property
+    def first(self):
+        return self._nodes[0] if self._nodes else _CapturedNode({})
+
+class CapturedPost:
+    """Read-only stand-in for a post element, rebuilt from a capture_post payload."""
+
+    _CHILDREN = ("a", "abbr", "time")
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def get_attribute(self, name):
+        return self.payload.get("attrs", {}).get(name)
+
+    def inner_text(self, timeout=None):
+        return self.payload.get("text", "")
+
+    def locator(self, selector):
+        if selector not in self._CHILDREN:
+            return _CapturedLocator([])
+        return _CapturedLocator([_CapturedNode(d) for d in self.payload.get(selector, [])])
+
+class RawArchive:
+    """
+    Append-only archive of post captures: each chunk of up to `chunk_records` payloads is one
+    gzip member of JSON lines appended to `path`, and `path`.idx gets one JSON line per chunk
+    ({"offset", "length", "records"}). Readers trust only indexed chunks, so a run killed
+    mid-write leaves the archive readable.
+    """
+
+    def __init__(self, path, chunk_records=ARCHIVE_CHUNK_RECORDS, compresslevel=6):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.chunk_records = max(1, int(chunk_records))
+        self.compresslevel = compresslevel
+        self.records = 0
+        self.bytes_written = 0
+        self._pending = []
+        if not os.path.exists(self.index_path) and os.path.exists(path) and os.path.getsize(path):
+            raise ValueError(f"{path} is not an archive (no {self.index_path}); refusing to append to it")
+        # drop whatever an interrupted run left past the last complete index entry, in both
+        # the index (so new entries start on a fresh line) and the data file
+        chunks, valid = _scan_archive_index(path)
+        end = chunks[-1]["offset"] + chunks[-1]["length"] if chunks else 0
+        with open(self.index_path, "ab") as f:
+            f.truncate(valid)
+        with open(path, "ab") as f:
+            f.truncate(end)
+
+    def append(self, payload):
+        self._pending.append(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        if len(self._pending) >= self.chunk_records:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        data = gzip.compress(("\n".join(self._pending) + "\n").encode("utf-8"), compresslevel=self.compresslevel)
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"offset": offset, "length": len(data), "records": len(self._pending)}) + "\n")
+        self.records += len(self._pending)
+        self.bytes_written += len(data)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+
+def _scan_archive_index(path):
+    # (chunks, valid index bytes): stops at the first torn, unparsable or malformed line, or
+    # at an entry that does not continue the previous chunk inside the data file
+    chunks = []
+    valid = 0
+    try:
+        data_size = os.path.getsize(path)
+        with open(path + ".idx", "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    chunk = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(chunk, dict):
+                    break
+                offset, length = chunk.get("offset"), chunk.get("length")
+                if any(type(v) is not int for v in (offset, length)) or length <= 0:
+                    break
+                end = chunks[-1]["offset"] + chunks[-1]["length"] if chunks else 0
+                if offset != end or end + length > data_size:
+                    break
+                chunks.append(chunk)
+                valid += len(line)
+    except OSError:
+        pass
+    return chunks, valid
+
+def read_archive_index(path):
+    """Chunk entries of an archive's index, stopping at the first torn or inconsistent line."""
+    return _scan_archive_index(path)[0]
+
+def _read_chunk(f, chunk):
+    f.seek(chunk["offset"])
+    return [json.loads(line) for line in gzip.decompress(f.read(chunk["length"])).splitlines() if line]
+
+def iter_archive(path):
+    """Yield capture payloads from every indexed chunk of an archive, in write order."""
+    with open(path, "rb") as f:
+        for chunk in read_archive_index(path):
+            yield from _read_chunk(f, chunk)
+
+def _replay_chunk(task):
+    # (email, source, link, post_id) for the first sighting of each email within one chunk
+    path, chunk = task
+    with open(path, "rb") as f:
+        payloads = _read_chunk(f, chunk)
+    seen = set()
+    found = []
+    for payload in payloads:
+        emails = [e for e in extract_emails(payload.get("text", "")) if e not in seen]
+        if not emails:
+            continue
+        record = PostRecord.from_post(CapturedPost(payload))
+        for e in emails:
+            seen.add(e)
+            found.append((e, payload.get("src") or "replay", record.link, record.post_id))
+    return found, len(payloads)
+
+def replay_archive(path, workers=1):
+    """
+    Run the current parsers over an archive, one indexed chunk per task (spread over a
+    process pool when workers > 1). Returns (EmailHit list for first sightings in archive
+    order, number of posts replayed).
+    """
+    tasks = [(path, chunk) for chunk in read_archive_index(path)]
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    seen = set()
+    hits = []
+    posts = 0
+
+    def merge(results):
+        nonlocal posts
+        for found, n in results:
+            posts += n
+            for row in found:
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    hits.append(EmailHit(*row))
+
+    if workers == 1 or len(tasks) <= 1:
+        merge(map(_replay_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            merge(ex.map(_replay_chunk, tasks))
+    return hits, posts
+
+def run_replay(args):
+    path = args.replay
+    if not read_archive_index(path):
+        log.error(f"[!] No indexed archive at {path}")
+        return
+    t0 = time.perf_counter()
+    hits, posts = replay_archive(path, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    base_dir = os.path.dirname(os.path.abspath(__file__)) or os.getcwd()
+    outfn = get_non_colliding_filename("emails_replay.csv", directory=base_dir)
+    with open(outfn, "w", newline="", encoding="utf-8") as fobj:
+        w = csv.writer(fobj)
+        w.writerow(["Email", "Source", "PostLink"])
+        w.writerows((h.email, h.source, h.link) for h in hits)
+    log.info(f"[*] Replayed {posts} posts in {elapsed:.1f}s ({posts / max(elapsed, 1e-9):,.0f} posts/s): "
+             f"{len(hits)} unique emails saved to {outfn}")
+
+# --scan-file: extraction over large local text/HTML dumps, no browser involved
+SHARD_BYTES = 16 * 1024 * 1024  # bytes of input per shard; bounds per-worker memory
+SHARD_OVERLAP = 4096  # extra bytes each shard reads past its end for emails split across the edge
+SHARD_SNAP = 64 * 1024  # how far a shard edge may move to reach a newline / whitespace / tag end
+
+_SOFT_BOUNDARY_RE = re.compile(rb'[\s>]')
+
+def _snap_boundary(mm, pos, snap=SHARD_SNAP):
+    """
+    First cut point at or after pos within `snap` bytes: past a newline if there is one,
+    else past whitespace or a tag's '>' (newline-free dumps such as minified HTML), else a
+    hard cut at pos moved off any UTF-8 continuation bytes.
+    """
+    size = len(mm)
+    if pos >= size:
+        return size
+    limit = min(size, pos + snap)
+    nl = mm.find(b"\n", pos, limit)
+    if nl != -1:
+        return nl + 1
+    m = _SOFT_BOUNDARY_RE.search(mm, pos, limit)
+    if m:
+        return m.end()
+    while pos < limit and mm[pos] & 0xC0 == 0x80:
+        pos += 1
+    return pos
+
+def plan_shards(path, shard_bytes=SHARD_BYTES, snap=SHARD_SNAP):
+    """
+    Split a file into (start, end) byte ranges of ~shard_bytes (at most shard_bytes + snap),
+    each ending on a newline where one is near, else on whitespace / '>', else a hard cut.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    shards = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = _snap_boundary(mm, start + shard_bytes, snap)
+            shards.append((start, end))
+            start = end
+    return shards
+
+def scan_shard(path, start, end, overlap=SHARD_OVERLAP, snap=SHARD_SNAP):
+    """
+    Run extract_emails over bytes [start, end) of a memory-mapped file, reading on past
+    end + overlap to the next boundary (at most `snap` bytes further) so emails straddling
+    the shard edge are caught whole.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        stop = _snap_boundary(mm, end + overlap, snap)
+        data = mm[start:stop]
+    return extract_emails(data.decode("utf-8", errors="replace"))
+
+def _scan_shard_task(task):
+    return scan_shard(*task)
+
+def scan_file(path, workers=None, shard_bytes=SHARD_BYTES, overlap=SHARD_OVERLAP):
+    """Extract unique emails from a large local file using a process pool over its shards."""
+    tasks = [(path, a, b, overlap) for a, b in plan_shards(path, shard_bytes)]
+    found = set()
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    if workers == 1 or len(tasks) <= 1:
+        for t in tasks:
+            found.update(_scan_shard_task(t))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for emails in ex.map(_scan_shard_task, tasks):
+                found.update(emails)
+    return sorted(found)
+
+def run_file_scan(args):
+    path = args.scan_file
+    if not os.path.isfile(path):
+        log.error(f"[!] No such file: {path}")
+        return
+    size = os.path.getsize(path)
+    log.info(f"[*] Scanning {path} ({size / 1e6:,.1f} MB) with {args.workers or os.cpu_count()} worker(s)")
+    t0 = time.perf_counter()
+    emails = scan_file(path, workers=args.workers, shard_bytes=int(args.shard_mb * 1024 * 1024))
+    elapsed = time.perf_counter() - t0
+    base_dir = os.path.dirname(os.path.abspath(__file__)) or os.getcwd()
+    outfn = get_non_colliding_filename("emails_file.csv", directory=base_dir)
+    with open(outfn, "w", newline="", encoding="utf-8") as fobj:
+        w = csv.writer(fobj)
+        w.writerow(["Email", "Source", "PostLink"])
+        w.writerows((e, "file", path) for e in emails)
+    log.info(f"[*] {len(emails)} unique emails in {elapsed:.1f}s ({size / 1e6 / max(elapsed, 1e-9):,.1f} MB/s), saved to {outfn}")
+
+class PostRecord(namedtuple("PostRecord", "post_id link author_username author_id author_href post_date")):
+    """Metadata of one scanned post (tuple-sized, no per-instance __dict__)."""
+    __slots__ = ()
+
+    @classmethod
+    def from_post(cls, post, link=None):
+        # walks the post's anchors once per field: pass a CapturedPost for a live page
+        return cls(
+            extract_post_id(post),
+            get_first_post_link(post) if link is None else link,
+            extract_author_username(post),
+            extract_author_id(post),
+            extract_author_profile_href(post),
+            extract_post_date(post),
+        )
+
+class EmailHit(namedtuple("EmailHit", "email source link post_id")):
+    """One extracted email and where it was found."""
+    __slots__ = ()
+
+    @property
+    def domain(self):
+        return self.email.rpartition("@")[2]
+
+class HitBatch:
+    """
+    Columnar buffer of EmailHit rows waiting to be written.
+    Repeated strings (source, link, post_id, domain) are interned so a post with many
+    hits, or a source shared by every row, is stored once.
+    """
+    __slots__ = ("emails", "sources", "links", "post_ids", "domains")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.emails = []
+        self.sources = []
+        self.links = []
+        self.post_ids = []
+        self.domains = []
+
+    def add(self, email, source, link="", post_id=""):
+        self.emails.append(email)
+        self.sources.append(sys.intern(source))
+        self.links.append(sys.intern(link or ""))
+        self.post_ids.append(sys.intern(post_id or ""))
+        self.domains.append(sys.intern(email.rpartition("@")[2]))
+
+    def append(self, hit):
+        self.add(hit.email, hit.source, hit.link, hit.post_id)
+
+    def __len__(self):
+        return len(self.emails)
+
+    def hits(self):
+        return [EmailHit(*row) for row in zip(self.emails, self.sources, self.links, self.post_ids)]
+
+    def rows(self):
+        """Rows in the CSV column order (Email, Source, PostLink)."""
+        return list(zip(self.emails, self.sources, self.links))
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--start-url", default="https://web.facebook.com/groups/618488976536093/search?q=%40gmail.com")
     p.add_argument("--headless", action="store_true")
     p.add_argument("--edge-profile", default="", help="optional path to Edge user data dir to reuse login")
     p.add_argument("--max-per-file", type=int, default=1000, help="max emails per CSV file before rotating")
+    p.add_argument("--extract-cache", default="", help="optional JSON file to persist the extraction result cache across runs")
+    p.add_argument("--extract-cache-size", type=int, default=50000, help="max entries kept in the extraction result cache")
+    p.add_argument("--end-window", type=int, default=3,
+                   help="stop after this many scrolls in a row change neither post count nor page height")
+    p.add_argument("--block-resources", nargs="?", const=",".join(DEFAULT_BLOCKED_RESOURCES), default="",
+                   help="comma-separated resource types to abort (default when given without a value: "
+                        + ",".join(DEFAULT_BLOCKED_RESOURCES) + "); documents and scripts are always loaded")
+    p.add_argument("--network-stats", action="store_true",
+                   help="tally response bytes even without --block-resources (one extra call per request)")
+    p.add_argument("--log-level", default="INFO", help="DEBUG, INFO (default), WARNING or ERROR; per-email lines are INFO")
+    p.add_argument("--log-file", default="", help="optional JSON-lines log file, written from a background thread")
+    p.add_argument("--progress-interval", type=float, default=5.0, help="seconds between progress lines while scanning")
+    p.add_argument("--incremental", action="store_true",
+                   help="stop once the feed reaches posts already covered by the last completed run of this --start-url")
+    p.add_argument("--watermark-file", default=WATERMARK_FILE, help="JSON file holding per-start-url watermarks")
+    p.add_argument("--incremental-stop-after", type=int, default=3,
+                   help="old posts in a row that end an --incremental run (tolerates pinned posts)")
+    p.add_argument("--archive", default="", help="append each post's raw capture to this gzip-chunked archive")
+    p.add_argument("--replay", default="", help="re-extract emails from an --archive file instead of the browser")
+    p.add_argument("--scan-file", default="", help="extract emails from a local text/HTML dump instead of the browser")
+    p.add_argument("--workers", type=int, default=0, help="worker processes for --scan-file and --replay (default: CPU count)")
+    p.add_argument("--shard-mb", type=float, default=SHARD_BYTES / (1024 * 1024), help="shard size in MB for --scan-file")
     args = p.parse_args()
 
+    setup_logging(args.log_level, args.log_file)
+    if args.scan_file:
+        run_file_scan(args)
+        return
+    if args.replay:
+        run_replay(args)
+        return
+
+    extract_cache = ExtractionCache(max_entries=args.extract_cache_size, path=args.extract_cache or None)
+
     # choose a non-colliding filename in the script folder
     base_dir = os.path.dirname(os.path.abspath(__file__)) or os.getcwd()
     outfn = get_non_colliding_filename("emails_basic.csv", directory=base_dir)
     seen = set()
 
+    try:
+        archive = RawArchive(args.archive) if args.archive else None
+    except (OSError, ValueError) as e:
+        log.error(f"[!] {e}")
+        return
+
+    blocker = ResourceBlocker(args.block_resources.split(","), tally=args.network_stats)
+    if blocker.types:
+        log.info(f"[*] Blocking resource types: {', '.join(sorted(blocker.types))}")
+
     with sync_playwright() as pw:
         browser_ctx = None
         using_persistent = False
@@ -159,20 +1457,22 @@ def main():
             profile_path = args.edge_profile or (edge_default if os.path.exists(edge_default) else "")
 
             if profile_path:
-                print(f"[*] Launching Edge persistent context using profile: {profile_path}")
+                log.info(f"[*] Launching Edge persistent context using profile: {profile_path}")
                 browser_ctx = pw.chromium.launch_persistent_context(user_data_dir=profile_path,
                                                                     headless=args.headless,
                                                                     channel="msedge")
                 using_persistent = True
+                blocker.install(browser_ctx)
                 pages = getattr(browser_ctx, "pages", []) or []
                 page = pages[0] if pages else browser_ctx.new_page()
             else:
-                print("[*] No Edge profile found/provided — launching ephemeral Chromium context")
+                log.info("[*] No Edge profile found/provided — launching ephemeral Chromium context")
                 browser = pw.chromium.launch(headless=args.headless, channel="msedge")
                 browser_ctx = browser.new_context()
+                blocker.install(browser_ctx)
                 page = browser_ctx.new_page()
         except Exception as e:
-            print("Failed to launch browser/context:", e)
+            log.error(f"Failed to launch browser/context: {e}")
             return
 
         try:
@@ -191,12 +1491,11 @@ def main():
 
         # wait for posts
         try:
-            page.wait_for_selector("div[data-ad-preview='message'], article", timeout=DEFAULT_TIMEOUT)
+            page.wait_for_selector(POSTS_SELECTOR, timeout=DEFAULT_TIMEOUT)
         except Exception:
             pass
 
-        posts_selector = "div[data-ad-preview='message'], article"
-        posts = page.locator(posts_selector)
+        posts_selector = POSTS_SELECTOR
         total = 0
         # prepare rotating output files
         file_prefix = os.path.splitext(outfn)[0]  # "emails_basic"
@@ -209,124 +1508,94 @@ def main():
             fobj = open(fn, "w", newline="", encoding="utf-8")
             w = csv.writer(fobj)
             w.writerow(["Email", "Source", "PostLink"])
-            print(f"[*] Writing to {fn}")
+            log.info(f"[*] Writing to {fn}", extra={"event": "file", "file": fn})
             return fobj, w, fn
 
         fobj, writer, current_fn = open_new_file(file_index)
+        batch = HitBatch()
+        watermarks = incremental = None
+        if args.incremental:
+            watermarks = WatermarkStore(args.watermark_file)
+            previous = watermarks.get(args.start_url)
+            incremental = IncrementalScan(previous, stop_after=args.incremental_stop_after)
+            log.info(f"[*] Incremental run; watermark: {previous or 'none (full scan)'}")
+        expand_budget = ExpansionBudget()
+        progress = ProgressThrottle(args.progress_interval)
 
-        last_index = 0
-        scroll_attempts = 0
-        max_scrolls = 200
-        no_new_rounds = 0
-
-        print("[*] Scanning posts and scrolling to load more. Press Ctrl+C to stop.")
-        while scroll_attempts < max_scrolls:
-            try:
-                # refresh locator and count
-                posts = page.locator(posts_selector)
-                try:
-                    count = posts.count()
-                except Exception:
-                    count = 0
-
-                if count <= last_index:
-                    no_new_rounds += 1
-                else:
-                    no_new_rounds = 0
-
-                # prepare new_found flag for this iteration
-                new_found = False
-
-                # debug: show progress each iteration (shows before processing new posts)
-                print(f"[*] progress: total_posts={count} scanned_until={last_index} no_new_rounds={no_new_rounds} scroll_attempts={scroll_attempts}")
-
-                for i in range(last_index, count):
+        def flush_hits():
+            # write buffered hits in chunks, rotating files at max_per_file rows
+            nonlocal fobj, writer, current_fn, file_index, file_count_in_file
+            rows = batch.rows()
+            start = 0
+            while start < len(rows):
+                if file_count_in_file >= max_per_file:
                     try:
-                        post = posts.nth(i)
-                        # attempt to expand caption "See more" inside the post up to a few times
-                        for _ in range(4):
-                            try:
-                                btns = post.locator("text=/see more/i")
-                                if btns.count():
-                                    try:
-                                        btns.first.click()
-                                        page.wait_for_timeout(400)  # allow UI to expand
-                                    except Exception:
-                                        break
-                                else:
-                                    break
-                            except Exception:
-                                break
-
-                        # retrieve visible caption/text
-                        try:
-                            text = post.inner_text(timeout=2500) or ""
-                        except Exception:
-                            text = ""
-
-                        emails = extract_emails(text)
-                        link = get_first_post_link(post)
-                        for e in emails:
-                            if e in seen:
-                                continue
-                            # rotate file if needed
-                            if file_count_in_file >= max_per_file:
-                                try:
-                                    fobj.close()
-                                except Exception:
-                                    pass
-                                file_index += 1
-                                fobj, writer, current_fn = open_new_file(file_index)
-                                file_count_in_file = 0
-                            seen.add(e)
-                            writer.writerow([e, "post", link])
-                            file_count_in_file += 1
-                            total += 1
-                            new_found = True
-                            print(f"[+] {e} -> {link} (saved to {current_fn})")
+                        fobj.close()
                     except Exception:
-                        continue
-
-                last_index = max(last_index, count)
-
-                # if we found new emails recently, reset scroll attempts heuristic
-                if new_found:
-                    scroll_attempts = 0
+                        pass
+                    file_index += 1
+                    fobj, writer, current_fn = open_new_file(file_index)
+                    file_count_in_file = 0
+                chunk = rows[start:start + max_per_file - file_count_in_file]
+                writer.writerows(chunk)
+                if log.isEnabledFor(logging.INFO):
+                    for e, _, link in chunk:
+                        log.info(f"[+] {e} -> {link} (saved to {current_fn})",
+                                 extra={"event": "email", "email": e, "link": link, "file": current_fn})
+                file_count_in_file += len(chunk)
+                start += len(chunk)
+            try:
+                fobj.flush()
+            except Exception:
+                pass
+            batch.clear()
 
-                # stop when we've had a few rounds with nothing new and we've scrolled enough
-                if no_new_rounds >= 5:
-                    # perform a scroll to try load more
-                    try:
-                        page.mouse.wheel(0, 3000)
-                    except Exception:
-                        try:
-                            page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-                        except Exception:
-                            pass
-                    time.sleep(1.0)
-                    scroll_attempts += 1
-                    # be much more patient; allow more scroll attempts before stopping
-                    if scroll_attempts >= 60:
-                        break
-                else:
-                    # small pause to allow lazy-load
-                    time.sleep(0.6)
+        def handle_post(post):
+            nonlocal total
+            # retrieve visible caption/text, expanding "See more" only when truncated
+            text = read_post_text(page, post, expand_budget)
+            captured = capture_for_run(post, text, args.start_url, archive, incremental)
+            if captured is STOP_SCAN:
+                return STOP_SCAN
+            emails = [e for e in extract_cache.extract(text) if e not in seen]
+            if not emails:
+                return False
+            # one evaluate round trip for every attribute the parsers read, instead of a
+            # get_attribute call per anchor for each PostRecord field
+            if captured is None:
+                captured = CapturedPost(capture_post(post, text, source=args.start_url))
+            record = PostRecord.from_post(captured)
+            for e in emails:
+                seen.add(e)
+                batch.add(e, "post", record.link, record.post_id)
+                total += 1
+            return True
 
-            except KeyboardInterrupt:
-                print("[!] Interrupted by user.")
-                break
-            except Exception:
-                # best-effort continue
-                try:
-                    page.mouse.wheel(0, 2000)
-                except Exception:
-                    pass
-                time.sleep(0.8)
-                continue
+        log.info("[*] Scanning posts and scrolling to load more. Press Ctrl+C to stop.")
+        reason = scan_feed(page, handle_post, FeedEndDetector(args.end_window), posts_selector=posts_selector,
+                           on_round=flush_hits, progress=progress)
+        log.info(f"[*] Scan stopped: {reason}", extra={"event": "stop", "reason": reason})
+        if incremental is not None:
+            # only a run that covered everything down to the old watermark may move it
+            if finish_incremental(watermarks, args.start_url, incremental, reason):
+                log.info(f"[*] {incremental.new_posts} new posts; watermark saved to {watermarks.path}")
+            else:
+                log.warning(f"[!] Scan ended early ({reason}); watermark left unchanged.")
 
-        # end while
-        print(f"[*] Found {len(seen)} unique emails so far.")
-        print(f"[*] Extraction complete. {total} unique emails saved across {file_index} file(s).")
+        flush_hits()
+        if archive is not None:
+            archive.close()
+            log.info(f"[*] Archive: {archive.records} posts, {archive.bytes_written / 1e6:,.2f} MB appended to {archive.path}")
+        log.info(f"[*] Found {len(seen)} unique emails so far.")
+        log.info(f"[*] Extraction complete. {total} unique emails saved across {file_index} file(s).",
+                 extra={"event": "done", "emails": total, "files": file_index})
+        cs = extract_cache.stats()
+        log.info(f"[*] Extraction cache: {cs['entries']} entries, hit rate {cs['hit_rate']:.1%} ({cs['hits']} hits / {cs['misses']} misses)")
+        extract_cache.save()
+        log.info(f"[*] Network: {blocker.summary(process_rss())}")
+        log.info(f"[*] See more: {expand_budget.expanded} expanded, {expand_budget.stalled} stalled, "
+                 f"{expand_budget.skipped} posts not truncated, {expand_budget.unreadable} unreadable "
+                 f"({expand_budget.text_retries} slow reads retried); wait cap {expand_budget.wait_ms()} ms")
         try:
             fobj.close()
         except Exception:
@@ -334,7 +1603,7 @@ def main():
 
         try:
             if using_persistent:
-                print("[*] Persistent context left open for your session.")
+                log.info("[*] Persistent context left open for your session.")
             else:
                 page.close()
                 browser_ctx.close()
@@ -1,15 +1,29 @@
 import importlib.util
 import os
+import sys
 
-# Load the original "web scrapper.py" module (keeps filename with space intact)
+# Load the original "web scrapper.py" module (keeps filename with space intact) once, and
+# register it in sys.modules so process pools can pickle its task functions by reference
 _here = os.path.dirname(__file__)
 _src_path = os.path.join(_here, "web scrapper.py")
-_spec = importlib.util.spec_from_file_location("web_scraper_orig", _src_path)
-_web_mod = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_web_mod)
+_web_mod = sys.modules.get("web_scraper_orig")
+if _web_mod is None:
+    _spec = importlib.util.spec_from_file_location("web_scraper_orig", _src_path)
+    _web_mod = importlib.util.module_from_spec(_spec)
+    sys.modules["web_scraper_orig"] = _web_mod
+    try:
+        _spec.loader.exec_module(_web_mod)
+    except BaseException:
+        del sys.modules["web_scraper_orig"]
+        raise
 
 # Re-export parsing/extraction helpers with a friendly module name (no spaces)
 extract_emails = _web_mod.extract_emails
+normalize_text = _web_mod.normalize_text
+ExtractionCache = _web_mod.ExtractionCache
+EXTRACT_ENGINE_VERSION = _web_mod.EXTRACT_ENGINE_VERSION
+locate_candidate_windows = _web_mod.locate_candidate_windows
+extract_emails_windowed = _web_mod.extract_emails_windowed
 get_safe_filename = _web_mod.get_safe_filename
 extract_post_id = _web_mod.extract_post_id
 extract_author_username = _web_mod.extract_author_username
@@ -17,11 +31,46 @@ extract_author_id = _web_mod.extract_author_id
 extract_author_profile_href = _web_mod.extract_author_profile_href
 extract_post_date = _web_mod.extract_post_date
 get_gender_for_profile = _web_mod.get_gender_for_profile
+JsonLinesFormatter = _web_mod.JsonLinesFormatter
+setup_logging = _web_mod.setup_logging
+shutdown_logging = _web_mod.shutdown_logging
+ProgressThrottle = _web_mod.ProgressThrottle
+ExpansionBudget = _web_mod.ExpansionBudget
+read_post_text = _web_mod.read_post_text
+FeedEndDetector = _web_mod.FeedEndDetector
+feed_state = _web_mod.feed_state
+scan_feed = _web_mod.scan_feed
+capture_post = _web_mod.capture_post
+CapturedPost = _web_mod.CapturedPost
+RawArchive = _web_mod.RawArchive
+read_archive_index = _web_mod.read_archive_index
+iter_archive = _web_mod.iter_archive
+replay_archive = _web_mod.replay_archive
+STOP_SCAN = _web_mod.STOP_SCAN
+WatermarkStore = _web_mod.WatermarkStore
+IncrementalScan = _web_mod.IncrementalScan
+WATERMARK_STOPS = _web_mod.WATERMARK_STOPS
+capture_for_run = _web_mod.capture_for_run
+finish_incremental = _web_mod.finish_incremental
+ResourceBlocker = _web_mod.ResourceBlocker
+process_rss = _web_mod.process_rss
+DEFAULT_BLOCKED_RESOURCES = _web_mod.DEFAULT_BLOCKED_RESOURCES
+plan_shards = _web_mod.plan_shards
+scan_shard = _web_mod.scan_shard
+scan_file = _web_mod.scan_file
+PostRecord = _web_mod.PostRecord
+EmailHit = _web_mod.EmailHit
+HitBatch = _web_mod.HitBatch
 load_cache = _web_mod.load_cache
 save_cache = _web_mod.save_cache
 
 __all__ = [
     "extract_emails",
+    "normalize_text",
+    "ExtractionCache",
+    "EXTRACT_ENGINE_VERSION",
+    "locate_candidate_windows",
+    "extract_emails_windowed",
     "get_safe_filename",
     "extract_post_id",
     "extract_author_username",
@@ -29,6 +78,36 @@ __all__ = [
     "extract_author_profile_href",
     "extract_post_date",
     "get_gender_for_profile",
+    "JsonLinesFormatter",
+    "setup_logging",
+    "shutdown_logging",
+    "ProgressThrottle",
+    "ExpansionBudget",
+    "read_post_text",
+    "FeedEndDetector",
+    "feed_state",
+    "scan_feed",
+    "capture_post",
+    "CapturedPost",
+    "RawArchive",
+    "read_archive_index",
+    "iter_archive",
+    "replay_archive",
+    "STOP_SCAN",
+    "WatermarkStore",
+    "IncrementalScan",
+    "WATERMARK_STOPS",
+    "capture_for_run",
+    "finish_incremental",
+    "ResourceBlocker",
+    "process_rss",
+    "DEFAULT_BLOCKED_RESOURCES",
+    "plan_shards",
+    "scan_shard",
+    "scan_file",
+    "PostRecord",
+    "EmailHit",
+    "HitBatch",
     "load_cache",
     "save_cache",
 ]
\ No newline at end of file